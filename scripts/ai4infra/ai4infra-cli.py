@@ -3,6 +3,7 @@
 # Standard library imports
 import os
 import re
+import shutil
 import subprocess
 import json
 import sys
@@ -17,48 +18,39 @@ from dotenv import load_dotenv
 # Local imports
 from common.logger import log_debug, log_error, log_info, log_warn
 
-# base manager
-from utils.container.base_manager import stop_container
-from utils.container.base_manager import copy_template
-from utils.container.base_manager import start_container
-from utils.container.base_manager import ensure_network
-
-# backup & restore
-from utils.container.backup_manager import backup_data
-from utils.container.backup_manager import restore_data
-
-# USB secrets
-from utils.container.usb_secrets import setup_usb_secrets
-
-# healthcheck modules
-from utils.container.healthcheck import check_container
-from utils.container.health_vault import check_vault
-from utils.container.health_postgres import check_postgres
-
-# service discovery
-from utils.container.installer import discover_services, is_hot_backup_service
-from common.load_config import load_config
-
-# env manager
-from utils.container.env_manager import generate_env
-from utils.container.nginx_manager import setup_nginx_for_service
-# -------------------------------------------------------------
-# 인증서 모듈 (기존 유지, 한 줄씩)
-# -------------------------------------------------------------
-from utils.certs_manager import generate_root_ca_if_needed
-from utils.certs_manager import create_service_certificate
-from utils.certs_manager import apply_service_permissions
-from utils.certs_manager import install_root_ca_windows
-
+# [Lazy Import] utils.* 모듈은 각 명령 함수 내부에서 import
+# - --help, unseal-vault 등 가벼운 명령이 certs/backup/nginx 모듈 로딩 비용을 치르지 않도록 함
+# - 필요한 명령에서만 해당 모듈을 불러온다 (2회차부터는 sys.modules 캐시)
 
 load_dotenv()
 PROJECT_ROOT = os.getenv("PROJECT_ROOT")
 BASE_DIR = os.getenv('BASE_DIR', '/opt/ai4infra')
 app = typer.Typer(help="AI4INFRA 서비스 관리")
 
+# [Design Strategy] Core vs Add-on Separation
+# Core services must be installed in strict dependency order.
+# Add-ons can be installed afterwards.
+CORE_ORDER = ("postgres", "vault", "ldap", "keycloak", "nginx")
+
+
+def _remove_dir(path: str) -> bool:
+    """
+    디렉터리 삭제 - 존재할 때만, 가능하면 프로세스 내에서(shutil.rmtree) 처리.
+    권한이 없으면(root 소유 등) sudo rm -rf 로 대체.
+    """
+    if not os.path.isdir(path):
+        return False
+    try:
+        shutil.rmtree(path)
+    except PermissionError:
+        subprocess.run(["sudo", "rm", "-rf", path], check=True)
+    return True
+
 
 @app.command()
 def generate_rootca():
+    from utils.certs_manager import generate_root_ca_if_needed
+
     generate_root_ca_if_needed()
 
 def _ensure_postgres_db(db_name="keycloak", db_user="keycloak", env_password_key="KEYCLOAK_DB_PASSWORD"):
@@ -66,6 +58,8 @@ def _ensure_postgres_db(db_name="keycloak", db_user="keycloak", env_password_key
     운영 중인 Postgres에 DB/User가 없으면 자동 생성.
     (비밀번호는 .env의 env_password_key 참조)
     """
+    from utils.container.healthcheck import check_container
+
     log_info(f"[_ensure_postgres_db] {db_name} 데이터베이스 확인 중...")
     
     # 1. Postgres 컨테이너 실행 여부 확인
@@ -135,21 +129,25 @@ def install(
     service: str = typer.Argument("all", help="설치할 서비스 이름"),
     reset: bool = typer.Option(False, "--reset", help="기존 데이터/컨테이너 삭제 후 완전 재설치 (개발용)")
 ):
+    from utils.container.base_manager import stop_container, copy_template, start_container
+    from utils.container.healthcheck import check_container
+    from utils.container.health_vault import check_vault
+    from utils.container.health_postgres import check_postgres
+    from utils.container.installer import discover_services
+    from utils.container.env_manager import generate_env
+    from utils.container.nginx_manager import setup_nginx_for_service
+    from utils.certs_manager import create_service_certificate, apply_service_permissions
+    from utils.certs_manager import create_service_certificates
     
     # discover_services() 함수로 서비스 목록을 가져옴
-    
-    # [Design Strategy] Core vs Add-on Separation
-    # Core services must be installed in strict dependency order.
-    # Add-ons can be installed afterwards.
-    CORE_ORDER = ["postgres", "vault", "ldap", "keycloak", "nginx"]
-    
     if service == "all":
-        discovered = set(discover_services())
+        discovered = discover_services()
+        discovered_set = set(discovered)
         
         # 1. Filter Core services present in discovery
-        core_to_install = [s for s in CORE_ORDER if s in discovered]
+        core_to_install = [s for s in CORE_ORDER if s in discovered_set]
         
-        # 2. Add-ons are everything else
+        # 2. Add-ons are everything else (discovery 순서 유지)
         addons_to_install = [s for s in discovered if s not in CORE_ORDER]
         
         # 3. Final ordered list
@@ -158,9 +156,16 @@ def install(
         log_info(f"[install|all] Installation Order: {services}")
     else:
         services = [service]
+
+    # 다수 서비스 설치 시 인증서(키 생성)를 먼저 병렬 생성
+    # - 루프 내 create_service_certificate는 기존 key/cert를 재사용 (rootCA 복사만 수행)
+    # - --reset 은 루프에서 서비스 폴더를 삭제하므로 제외
+    if len(services) > 1 and not reset:
+        create_service_certificates(services)
         
     for svc in services:
         service_dir = f"{BASE_DIR}/{svc}"
+        container_name = f"ai4infra-{svc}"
 
         # [Keycloak 전처리] DB 준비
         if svc == "keycloak":
@@ -173,13 +178,15 @@ def install(
              _ensure_postgres_db(db_name=db_name, db_user="orthanc", env_password_key="ORTHANC_DB_PASSWORD")
 
         # 1) 컨테이너 중지
-        stop_container(f"ai4infra-{svc}")
+        stop_container(container_name)
 
         # 2) 데이터 처리
         if reset:
             log_info(f"[install] --reset 모드: {svc} 서비스폴더 삭제진행")
-            subprocess.run(["rm", "-rf", service_dir], capture_output=True, text=True)
-            log_info(f"[install] {service_dir} 삭제 완료")
+            if _remove_dir(service_dir):
+                log_info(f"[install] {service_dir} 삭제 완료")
+            else:
+                log_info(f"[install] {service_dir} 없음 (삭제 생략)")
 
         else:
             # 멱등성 모드
@@ -272,6 +279,9 @@ def backup(
     - 기본: Hot Backup (운영 중 백업, 중단 없음) -> Cron/Daily용
     - --cold: Cold Backup (중지 후 백업) -> 점검/마이그레이션용
     """
+    from utils.container.base_manager import stop_container, start_container
+    from utils.container.backup_manager import backup_data
+    from utils.container.installer import discover_services
 
     services = list(discover_services()) if service == "all" else [service]
     backup_files = []
@@ -315,6 +325,13 @@ def restore(
     - Postgres/Vault: 서비스가 켜진 상태에서 API/CLI로 데이터 주입
     - 기타: 서비스 중지 후 데이터 파일 덮어쓰기
     """
+    from utils.container.base_manager import stop_container, start_container
+    from utils.container.backup_manager import restore_data
+    from utils.container.healthcheck import check_container
+    from utils.container.health_vault import check_vault
+    from utils.container.health_postgres import check_postgres
+    from utils.container.env_manager import generate_env
+    from utils.certs_manager import apply_service_permissions
     
     # 1. 백업 파일 결정
     if backup_file is None:
@@ -404,15 +421,12 @@ def restore(
 @app.command()
 def init_vault():
     """Vault 프로덕션 모드 초기화 - 첫 실행 시에만"""
+    from utils.container.base_manager import running_containers
+
     log_info("[init_vault] Vault 초기화 시작")
 
     # 1) Vault 컨테이너 실행 확인
-    result = subprocess.run(
-        ['docker', 'ps', '--filter', 'name=ai4infra-vault', '--format', '{{.Names}}'],
-        capture_output=True, text=True
-    )
-
-    if 'ai4infra-vault' not in result.stdout:
+    if 'ai4infra-vault' not in (running_containers() or ()):
         log_error("[init_vault] Vault 컨테이너가 실행되지 않았습니다. 먼저 'ai4infra install vault' 실행하십시오.")
         return
 
@@ -433,53 +447,64 @@ def init_vault():
 
     # 3) Vault init 실행
     # 3) Vault init 실행
-    init_cmd = [
+    vault_init = [
         'docker', 'exec', '-i', 
         '-e', 'VAULT_ADDR=https://127.0.0.1:8200',  # [Fix] TLS 인증서 IP 불일치 해결
         'ai4infra-vault',
         'vault', 'operator', 'init',
+    ]
+    init_cmd = [
+        *vault_init,
         '-key-shares=5',
         '-key-threshold=3',
         '-format=json'
     ]
 
-    try:
-        # JSON 캡처
-        result = subprocess.run(init_cmd, capture_output=True, text=True, check=True)
-        init_json = result.stdout
-        
-        # [Dev Simulation] Mock USB 저장
-        mock_usb_dir = f"{PROJECT_ROOT}/mock_usb"
-        os.makedirs(mock_usb_dir, exist_ok=True)
-        key_file_path = f"{mock_usb_dir}/vault_keys.json"
-        
-        with open(key_file_path, "w") as f:
-            f.write(init_json)
-            
-        # 사용자 출력
-        print("\n-------------------------------------------------------------------")
-        print(" 초기화가 정상적으로 완료되었습니다.")
-        print(f" [SIMULATION] Key가 가상 USB에 저장되었습니다: {key_file_path}")
-        print(" 이 파일은 .gitignore에 등록되어 버전 관리에서 제외됩니다.")
-        print(" unseal-vault 실행 시 자동으로 감지되어 처리됩니다.")
-        print("-------------------------------------------------------------------")
-        
-        # 보안상 화면 출력은 최소화 (필요시 주석 해제)
-        # print("\n--- Init Output (JSON) ---\n")
-        # print(init_json)
-        # print("\n--------------------------\n")
-        
-        print(" 다음 단계:")
-        print("   ai4infra unseal-vault")
-        print("-------------------------------------------------------------------\n")
+    # stdout/stderr 동시 수집 (키 JSON은 보안상 화면에 출력하지 않음)
+    proc = subprocess.run(init_cmd, capture_output=True, text=True)
+    init_json, stderr = proc.stdout, proc.stderr
 
-    except subprocess.CalledProcessError as e:
-        if e.stderr and "Vault is already initialized" in e.stderr:
+    # JSON 파싱 성공 여부 + 종료코드로 분기 (stderr 문자열 매칭에 의존하지 않음)
+    try:
+        init_data = json.loads(init_json)
+    except json.JSONDecodeError:
+        init_data = None
+
+    if proc.returncode != 0 or not isinstance(init_data, dict) or "unseal_keys_b64" not in init_data:
+        # 실패 시에만 상태 확인: 'vault operator init -status' 종료코드 0 = 이미 초기화됨
+        status = subprocess.run([*vault_init, '-status'], capture_output=True)
+        if status.returncode == 0:
             log_info("[init_vault] Vault는 이미 초기화되어 있습니다.")
         else:
             log_error("[init_vault] 초기화 실패")
-            if e.stderr:
-                print(e.stderr)
+            if stderr:
+                print(stderr)
+        return
+
+    # [Dev Simulation] Mock USB 저장
+    mock_usb_dir = f"{PROJECT_ROOT}/mock_usb"
+    os.makedirs(mock_usb_dir, exist_ok=True)
+    key_file_path = f"{mock_usb_dir}/vault_keys.json"
+    
+    with open(key_file_path, "w") as f:
+        f.write(init_json)
+        
+    # 사용자 출력
+    print("\n-------------------------------------------------------------------")
+    print(" 초기화가 정상적으로 완료되었습니다.")
+    print(f" [SIMULATION] Key가 가상 USB에 저장되었습니다: {key_file_path}")
+    print(" 이 파일은 .gitignore에 등록되어 버전 관리에서 제외됩니다.")
+    print(" unseal-vault 실행 시 자동으로 감지되어 처리됩니다.")
+    print("-------------------------------------------------------------------")
+    
+    # 보안상 화면 출력은 최소화 (필요시 주석 해제)
+    # print("\n--- Init Output (JSON) ---\n")
+    # print(init_json)
+    # print("\n--------------------------\n")
+    
+    print(" 다음 단계:")
+    print("   ai4infra unseal-vault")
+    print("-------------------------------------------------------------------\n")
 
 
 def _execute_unseal_vault(interactive: bool = False):
@@ -724,9 +749,12 @@ def clean_backups(service: str = typer.Argument("all", help="백업을 삭제할
         log_info(f"[clean_backups] 삭제 중: {target_path}")
         try:
             # 디렉터리 자체를 삭제 (backup 시 mkdir -p로 재생성됨)
-            subprocess.run(['rm', '-rf', target_path], check=True)
+            if os.path.isdir(target_path):
+                _remove_dir(target_path)
+            else:
+                os.remove(target_path)
             log_info(f"[clean_backups] {t} 삭제 완료")
-        except subprocess.CalledProcessError as e:
+        except (OSError, subprocess.CalledProcessError) as e:
             log_error(f"[clean_backups] {t} 삭제 실패: {e}")
 
 @app.command()
@@ -734,6 +762,7 @@ def install_rootca_windows():
     """
     Windows에 Root CA 자동 설치 (WSL2 환경 전용)
     """
+    from utils.certs_manager import install_root_ca_windows
     
     install_root_ca_windows()
 
@@ -742,6 +771,9 @@ def setup_cron():
     """
     모든 서비스의 설정(backup.schedule)을 읽어 Crontab에 자동 백업 작업 등록
     """
+    from utils.container.installer import discover_services
+    from common.load_config import load_config
+
     log_info("[setup_cron] Cron 백업 스케줄 설정 시작")
     
     # 1. 설정 수집
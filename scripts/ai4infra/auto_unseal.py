@@ -2,6 +2,7 @@
 import os
 import sys
 import time
+import random
 import requests
 from glob import glob
 
@@ -23,8 +24,13 @@ USB_MOUNT_PATH = os.getenv("USB_DIR") or os.getenv("USB_MOUNT_PATH", "/mnt/usb")
 if not os.path.isabs(USB_MOUNT_PATH):
     USB_MOUNT_PATH = os.path.join(PROJECT_ROOT, USB_MOUNT_PATH)
 
-MAX_RETRIES = 5
-RETRY_DELAY = 2
+MAX_RETRIES = 9  # 대기 합계 약 16s (0.1+0.2+...+3.2+5+5, 마지막 시도 후 대기 없음)
+RETRY_BASE_DELAY = 0.1  # 0.1 → 0.2 → 0.4 ... (exponential backoff)
+RETRY_MAX_DELAY = 5
+
+# 단일 Session으로 TCP/TLS 연결 재사용 (상태 확인 + 키 제출)
+SESSION = requests.Session()
+SESSION.verify = False
 
 def log(msg):
     print(f"[Auto-Unseal] {msg}")
@@ -32,7 +38,7 @@ def log(msg):
 def check_vault_status():
     """Vault 상태 확인 (Sealed 여부)"""
     try:
-        resp = requests.get(f"{VAULT_ADDR}/v1/sys/health", verify=False)
+        resp = SESSION.get(f"{VAULT_ADDR}/v1/sys/health")
         # 200: Active, 429: Standby, 501: Not Init, 503: Sealed
         code = resp.status_code
         if code == 200:
@@ -56,7 +62,9 @@ def find_key_files():
         return []
     
     # 단순화를 위해 .key 파일을 평문 Unseal Key로 가정 (실전에서는 GPG Decrypt 필요)
+    # 최근 수정된 키(현재 세대일 가능성이 높음)부터 시도
     keys = glob(f"{USB_MOUNT_PATH}/*.key")
+    keys.sort(key=os.path.getmtime, reverse=True)
     return keys
 
 def unseal_vault(keys):
@@ -67,7 +75,7 @@ def unseal_vault(keys):
                 key = f.read().strip()
             
             payload = {"key": key}
-            resp = requests.post(f"{VAULT_ADDR}/v1/sys/unseal", json=payload, verify=False)
+            resp = SESSION.post(f"{VAULT_ADDR}/v1/sys/unseal", json=payload)
             
             if resp.status_code == 200:
                 data = resp.json()
@@ -88,13 +96,15 @@ def unseal_vault(keys):
 def main():
     log("Starting Auto-Unseal Process...")
     
-    # 1. Connection Check
+    # 1. Connection Check (exponential backoff + jitter)
+    delay = RETRY_BASE_DELAY
     for i in range(MAX_RETRIES):
         status = check_vault_status()
-        if status != "DOWN":
+        if status != "DOWN" or i == MAX_RETRIES - 1:
             break
         log(f"Vault is down. Retrying ({i+1}/{MAX_RETRIES})...")
-        time.sleep(RETRY_DELAY)
+        time.sleep(delay * (1 + random.random() * 0.2))
+        delay = min(delay * 2, RETRY_MAX_DELAY)
     
     if status == "DOWN":
         log("Error: Vault is unreachable.")
@@ -13,6 +13,9 @@ ADMIN_USER = os.getenv("KEYCLOAK_ADMIN", "admin")
 ADMIN_PASSWORD = os.getenv("KEYCLOAK_ADMIN_PASSWORD", "admin")
 REALM_NAME = "ai4infra"
 
+# 토큰 발급 → 사용자 생성 → (409) 조회 → 비밀번호 재설정을 하나의 keep-alive 연결로 처리
+SESSION = requests.Session()
+
 def get_admin_token():
     url = f"{KEYCLOAK_URL}/realms/master/protocol/openid-connect/token"
     payload = {
@@ -22,16 +25,18 @@ def get_admin_token():
         "grant_type": "password"
     }
     try:
-        resp = requests.post(url, data=payload)
+        resp = SESSION.post(url, data=payload)
         resp.raise_for_status()
-        return resp.json()["access_token"]
+        token = resp.json()["access_token"]
+        # 이후 Admin API 호출은 세션 헤더로 토큰을 전달
+        SESSION.headers["Authorization"] = f"Bearer {token}"
+        return token
     except Exception as e:
         print(f"Failed to get admin token: {e}")
         sys.exit(1)
 
-def create_local_user(token, username, password):
+def create_local_user(username, password):
     url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}/users"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     
     # payload
     payload = {
@@ -47,21 +52,30 @@ def create_local_user(token, username, password):
         }]
     }
     
-    resp = requests.post(url, json=payload, headers=headers)
-    if resp.status_code == 201:
-        print(f"User '{username}' created successfully.")
-    elif resp.status_code == 409:
+    # exact=true: 서버측 정확 일치 조회 (prefix 검색 결과 중 users[0] 오선택 방지)
+    # max=1 + briefRepresentation: id만 필요하므로 응답 크기 제한
+    params = {"exact": "true", "username": username, "max": 1, "briefRepresentation": "true"}
+    resp = SESSION.get(url, params=params)
+    resp.raise_for_status()
+    users = resp.json()
+    if users:
+        # 이미 존재 → 비밀번호만 재설정 (create → 409 → 조회 → 재설정 왕복 제거)
         print(f"User '{username}' already exists.")
-        # If exists, reset password
-        # Get User ID
-        users = requests.get(url, headers=headers, params={"username": username}).json()
         user_id = users[0]["id"]
-        pwd_url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}/users/{user_id}/reset-password"
-        requests.put(pwd_url, headers=headers, json={"type": "password", "value": password, "temporary": False})
-        print(f"Password reset for '{username}'.")
+        pwd_url = f"{url}/{user_id}/reset-password"
+        resp = SESSION.put(pwd_url, json=payload["credentials"][0])
+        if resp.ok:
+            print(f"Password reset for '{username}'.")
+        else:
+            print(f"Failed to reset password: {resp.text}")
+        return
+
+    resp = SESSION.post(url, json=payload)
+    if resp.status_code == 201:
+        print(f"User '{username}' created successfully.")
     else:
         print(f"Failed to create user: {resp.text}")
 
 if __name__ == "__main__":
-    token = get_admin_token()
-    create_local_user(token, "testuser", "testpassword")
+    get_admin_token()
+    create_local_user("testuser", "testpassword")
@@ -2,8 +2,10 @@
 import os
 import sys
 import time
+import random
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,6 +15,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(os.path.join(PROJECT_ROOT, "src"))
 
 from common.logger import log_info, log_error, log_warn
+from common.keycloak_session import make_keycloak_session
 
 # Configuration
 KEYCLOAK_HOST = os.getenv("KC_HOSTNAME", "auth.ai4infra.internal")
@@ -25,6 +28,17 @@ REALM_NAME = "ai4infra"
 LDAP_HOST = "ai4infra-ldap" # Internal docker name
 LDAP_PORT = "389"
 
+# Readiness 대기 (지수 백오프 + 지터)
+READY_MAX_ATTEMPTS = 8
+READY_BASE_DELAY = 0.5
+READY_MAX_DELAY = 30
+
+# 모든 Admin API 호출이 하나의 keep-alive 연결을 재사용
+SESSION = make_keycloak_session()
+
+# Readiness 폴링 전용 세션 - 내부 재시도 없음 (백오프는 wait_for_keycloak 가 담당)
+READY_SESSION = make_keycloak_session(retry=False)
+
 def get_admin_token():
     url = f"{KEYCLOAK_URL}/realms/master/protocol/openid-connect/token"
     payload = {
@@ -34,43 +48,41 @@ def get_admin_token():
         "grant_type": "password"
     }
     try:
-        resp = requests.post(url, data=payload)
+        resp = SESSION.post(url, data=payload)
         resp.raise_for_status()
-        return resp.json()["access_token"]
+        token = resp.json()["access_token"]
+        # 이후 Admin API 호출은 세션 헤더로 토큰 전달 (call site 별 headers 생략)
+        SESSION.headers["Authorization"] = f"Bearer {token}"
+        return token
     except Exception as e:
         log_error(f"Failed to get admin token: {e}")
         sys.exit(1)
 
-def create_realm(token):
+def create_realm():
     url = f"{KEYCLOAK_URL}/admin/realms"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    
-    # Check if realm exists
-    check_url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}"
-    resp = requests.get(check_url, headers=headers)
-    if resp.status_code == 200:
-        log_info(f"Realm '{REALM_NAME}' already exists.")
-        return
 
+    # 사전 GET 없이 생성 시도 → 409 는 이미 존재
     payload = {
         "realm": REALM_NAME,
         "enabled": True,
         "displayName": "AI4Infra Hospital"
     }
     
-    resp = requests.post(url, json=payload, headers=headers)
+    resp = SESSION.post(url, json=payload)
     if resp.status_code == 201:
         log_info(f"Realm '{REALM_NAME}' created successfully.")
+    elif resp.status_code == 409:
+        log_info(f"Realm '{REALM_NAME}' already exists.")
     else:
         log_error(f"Failed to create realm: {resp.text}")
 
-def configure_ldap(token):
+def configure_ldap():
     # Check existing storage providers
+    # (component 는 이름 중복을 409로 막지 않으므로 사전 조회 유지)
     url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}/components"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
     params = {"parent": REALM_NAME, "type": "org.keycloak.storage.UserStorageProvider"}
     
-    resp = requests.get(url, headers=headers, params=params)
+    resp = SESSION.get(url, params=params)
     existing = resp.json()
     for comp in existing:
         if comp["name"] == "openldap":
@@ -104,23 +116,16 @@ def configure_ldap(token):
         }
     }
     
-    resp = requests.post(url, json=payload, headers=headers)
+    resp = SESSION.post(url, json=payload)
     if resp.status_code == 201:
         log_info("LDAP provider configured successfully.")
     else:
         log_error(f"Failed to configure LDAP: {resp.text}")
 
-def create_oidc_client(token, client_id, redirect_uris):
+def create_oidc_client(client_id, redirect_uris):
     url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}/clients"
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
-    
-    # Check if client exists (list all and filter, Keycloak Client API is annoying)
-    resp = requests.get(url, headers=headers, params={"clientId": client_id})
-    clients = resp.json()
-    if clients:
-        log_info(f"Client '{client_id}' already exists.")
-        return
 
+    # 사전 GET 없이 생성 시도 → 409 는 이미 존재 (clientId 중복)
     payload = {
         "clientId": client_id,
         "enabled": True,
@@ -132,14 +137,13 @@ def create_oidc_client(token, client_id, redirect_uris):
         "protocol": "openid-connect"
     }
     
-    resp = requests.post(url, json=payload, headers=headers)
+    resp = SESSION.post(url, json=payload)
     if resp.status_code == 201:
         log_info(f"Client '{client_id}' created successfully.")
         
         # Add Mappers (uid -> preferred_username)
-        # Re-fetch id
-        resp = requests.get(url, headers=headers, params={"clientId": client_id})
-        client_uuid = resp.json()[0]["id"]
+        # 201 응답의 Location 헤더(.../clients/{id})에서 id 추출 → 재조회 생략
+        client_uuid = resp.headers["Location"].rsplit("/", 1)[-1]
         
         mapper_url = f"{KEYCLOAK_URL}/admin/realms/{REALM_NAME}/clients/{client_uuid}/protocol-mappers/models"
         mapper_payload = {
@@ -156,30 +160,54 @@ def create_oidc_client(token, client_id, redirect_uris):
                 "userinfo.token.claim": "true"
             }
         }
-        requests.post(mapper_url, json=mapper_payload, headers=headers)
-        
+        SESSION.post(mapper_url, json=mapper_payload)
+
+    elif resp.status_code == 409:
+        log_info(f"Client '{client_id}' already exists.")
     else:
         log_error(f"Failed to create client '{client_id}': {resp.text}")
 
 
-def main():
-    log_info("Waiting for Keycloak to be ready...")
-    # Simple wait loop
-    for _ in range(30):
+def wait_for_keycloak() -> bool:
+    """
+    Keycloak 준비 상태 대기 - 200 응답을 받을 때만 ready 로 판단
+    - /health/ready (KC_HEALTH_ENABLED=true) 우선, 비활성(404)이면 /realms/master 로 확인
+    """
+    ready_url = f"{KEYCLOAK_URL}/health/ready"
+    delay = READY_BASE_DELAY
+    for attempt in range(1, READY_MAX_ATTEMPTS + 1):
         try:
-            requests.get(KEYCLOAK_URL)
-            break
-        except requests.ConnectionError:
-            time.sleep(2)
-            print(".", end="", flush=True)
-    print("")
-
-    token = get_admin_token()
-    create_realm(token)
-    configure_ldap(token)
+            resp = READY_SESSION.get(ready_url, timeout=2)
+            if resp.status_code == 404 and ready_url.endswith("/health/ready"):
+                ready_url = f"{KEYCLOAK_URL}/realms/master"
+                resp = READY_SESSION.get(ready_url, timeout=2)
+            if resp.status_code == 200:
+                log_info(f"Keycloak is ready ({attempt} attempt(s)).")
+                return True
+        except requests.RequestException:
+            pass
+
+        if attempt < READY_MAX_ATTEMPTS:
+            time.sleep(delay * (1 + random.random() * 0.5))
+            delay = min(delay * 2, READY_MAX_DELAY)
+    return False
+
+
+def main():
+    if not wait_for_keycloak():
+        log_error("Keycloak is not ready. Aborting setup.")
+        sys.exit(1)
+
+    get_admin_token()
+    try:
+        create_realm()
+        configure_ldap()
+    except requests.RequestException as e:
+        log_error(f"Keycloak Admin API request failed: {e}")
+        sys.exit(1)
     
     # PACS Client (Legacy)
-    create_oidc_client(token, "orthanc", ["http://localhost:8042/*", "https://pacs.ai4infra.internal/*"])
+    orthanc_redirects = ["http://localhost:8042/*", "https://pacs.ai4infra.internal/*"]
 
     # Nginx Gateway Client (OpenResty)
     # Redirect URI must match lua-resty-openidc default (/redirect_uri)
@@ -191,7 +219,15 @@ def main():
         "https://pacs-pseudo.ai4infra.internal/redirect_uri",
         "https://*.ai4infra.internal/redirect_uri"
     ]
-    create_oidc_client(token, "nginx-gateway", gateway_redirects)
+
+    # clientId 별 생성은 서로 독립 → 동시 실행 (realm/LDAP 구성 이후)
+    clients = [("orthanc", orthanc_redirects), ("nginx-gateway", gateway_redirects)]
+    try:
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            list(ex.map(lambda c: create_oidc_client(*c), clients))
+    except requests.RequestException as e:
+        log_error(f"Keycloak Admin API request failed: {e}")
+        sys.exit(1)
 
     log_info("Keycloak automated setup complete.")
 
@@ -2,7 +2,7 @@
 import os
 import sys
 import subprocess
-import codecs
+from dataclasses import dataclass, asdict
 
 # Add project root to sys.path
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../"))
@@ -11,7 +11,7 @@ if PROJECT_ROOT not in sys.path:
 
 from common.logger import log_info, log_error
 
-USERS = [
+_RAW_USERS = [
     {"name": "Kevin Kim", "id": "rmchair", "email": "rmchair@r.python.study"}, # 김의학 -> Kevin Kim (English for LDAP safety)
     {"name": "Lee Pseudo", "id": "rmpseudo", "email": "rmpseudo@r.python.study"}, # 이가명
     {"name": "Park Security", "id": "rmsec", "email": "rmsec@r.python.study"}, # 박보안
@@ -27,19 +27,27 @@ USERS = [
     {"name": "Researcher Sample", "id": "researcher01", "email": "researcher01@r.python.study"}, # researcherXX
 ]
 
-LDIF_FILE = os.path.join(PROJECT_ROOT, "users_seed.ldif")
+@dataclass(frozen=True, slots=True)
+class User:
+    uid: str
+    cn: str
+    sn: str
+    mail: str
+    password: str
 
-def generate_ldif():
-    with codecs.open(LDIF_FILE, "w", "utf-8") as f:
-        for user in USERS:
-            uid = user["id"]
-            cn = user["name"]
-            sn = user["name"].split()[-1] # Last token as surname
-            mail = user["email"]
-            # Default password logic: [ID]_ldap
-            password = f"{uid}_ldap"
-            
-            entry = f"""dn: uid={uid},dc=ai4infra,dc=internal
+# 불변 튜플로 한 번만 구성 (surname/기본 비밀번호 사전 계산)
+USERS = tuple(
+    User(
+        uid=u["id"],
+        cn=u["name"],
+        sn=u["name"].rsplit(" ", 1)[-1],  # Last token as surname
+        mail=u["email"],
+        password=f"{u['id']}_ldap",  # Default password logic: [ID]_ldap
+    )
+    for u in _RAW_USERS
+)
+
+LDIF_TEMPLATE = """dn: uid={uid},dc=ai4infra,dc=internal
 changetype: add
 objectClass: inetOrgPerson
 objectClass: organizationalPerson
@@ -51,40 +59,33 @@ mail: {mail}
 userPassword: {password}
 
 """
-            f.write(entry)
-    log_info(f"Generated LDIF file at: {LDIF_FILE}")
 
-def apply_ldif():
+def generate_ldif() -> str:
+    # 사용자별 엔트리를 메모리에서 한 번에 조합 (임시 파일 없음)
+    return "".join(LDIF_TEMPLATE.format_map(asdict(user)) for user in USERS)
+
+def apply_ldif(ldif: str):
     container_name = "ai4infra-ldap"
-    target_path = "/tmp/users_seed.ldif"
-    
-    # Copy LDIF to container
-    cmd_cp = ["sudo", "docker", "cp", LDIF_FILE, f"{container_name}:{target_path}"]
-    subprocess.check_call(cmd_cp)
-    
-    # Run ldapadd
+
+    # Run ldapadd (LDIF는 stdin으로 전달 → docker cp/임시 파일 불필요)
     # -x: Simple authentication
     # -D: Bind DN
     # -w: Password (admin) - ideally from env but hardcoded for this setup script as per config
     cmd_ldapadd = [
-        "sudo", "docker", "exec", container_name,
-        "ldapadd", "-x", "-D", "cn=admin,dc=ai4infra,dc=internal", "-w", "admin", "-H", "ldap://localhost", "-f", target_path, "-c"
+        "sudo", "docker", "exec", "-i", container_name,
+        "ldapadd", "-x", "-D", "cn=admin,dc=ai4infra,dc=internal", "-w", "admin", "-H", "ldap://localhost", "-c"
     ]
     
     log_info("Applying LDIF to LDAP...")
     try:
         # -c continues on error (e.g. user already exists)
-        subprocess.check_call(cmd_ldapadd)
+        subprocess.run(cmd_ldapadd, input=ldif, text=True, check=True)
         log_info("Users added successfully (errors ignored for existing users).")
     except subprocess.CalledProcessError as e:
         log_error(f"Failed to add users: {e}")
 
 def main():
-    generate_ldif()
-    apply_ldif()
-    # Cleanup
-    if os.path.exists(LDIF_FILE):
-        os.remove(LDIF_FILE)
+    apply_ldif(generate_ldif())
 
 if __name__ == "__main__":
     main()
@@ -26,14 +26,24 @@ def generate_report_header(file_handle):
     file_handle.write(f"- **Tester**: Automated Test Runner\n\n")
     file_handle.write("---\n\n")
 
+SUMMARY_TEMPLATE = (
+    "## Summary\n\n"
+    "| Total | Pass | Fail | Skip |\n"
+    "| :---: | :--: | :--: | :--: |\n"
+    "| {:>6} | {:>6} | {:>6} | {:>6} |\n\n"
+)
+
 class ReportPlugin:
-    """Pytest plugin to capture results and write to Markdown."""
+    """Pytest plugin to stream results to Markdown as each test finishes."""
     def __init__(self, file_handle):
         self.file_handle = file_handle
-        self.results = []
         self.passed = 0
         self.failed = 0
         self.skipped = 0
+        # Summary는 고정 폭 자리만 먼저 확보 → 종료 시 같은 위치에 덮어씀
+        self.summary_offset = file_handle.tell()
+        file_handle.write(SUMMARY_TEMPLATE.format(0, 0, 0, 0))
+        file_handle.write("## Test Details\n\n")
 
     def pytest_runtest_logreport(self, report):
         if report.when == 'call':
@@ -46,24 +56,22 @@ class ReportPlugin:
                 self.skipped += 1
             else:
                 self.passed += 1
-            
-            self.results.append((report.nodeid, status, report.longrepr))
-
-    def write_summary(self):
-        self.file_handle.write("## Summary\n\n")
-        self.file_handle.write(f"| Total | Pass | Fail | Skip |\n")
-        self.file_handle.write(f"| :---: | :--: | :--: | :--: |\n")
-        self.file_handle.write(f"| {len(self.results)} | {self.passed} | {self.failed} | {self.skipped} |\n\n")
 
-    def write_details(self):
-        self.file_handle.write("## Test Details\n\n")
-        for nodeid, status, error in self.results:
+            # 결과를 즉시 기록 (중단 시에도 여기까지의 리포트 유지)
             icon = "✅" if status == "PASS" else "❌" if status == "FAIL" else "⚠️"
-            self.file_handle.write(f"### {icon} {nodeid}\n")
+            self.file_handle.write(f"### {icon} {report.nodeid}\n")
             self.file_handle.write(f"- **Result**: {status}\n")
-            if error:
-                self.file_handle.write(f"- **Error**:\n```\n{error}\n```\n")
+            if report.longrepr:
+                self.file_handle.write(f"- **Error**:\n```\n{report.longrepr}\n```\n")
             self.file_handle.write("\n")
+            self.file_handle.flush()
+
+    def write_summary(self):
+        total = self.passed + self.failed + self.skipped
+        end = self.file_handle.tell()
+        self.file_handle.seek(self.summary_offset)
+        self.file_handle.write(SUMMARY_TEMPLATE.format(total, self.passed, self.failed, self.skipped))
+        self.file_handle.seek(end)
 
 def main():
     print(f"🚀 Starting Test Runner for {VERSION}...")
@@ -72,6 +80,8 @@ def main():
     report_dir = setup_directories()
     report_file_name = f"report_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
     report_path = report_dir / report_file_name
+    # CI/도구 연동용 JUnit XML (pytest 내장 기능으로 생성, 마크다운과 같은 이름)
+    junit_path = report_path.with_suffix(".xml")
     
     print(f"📄 Report will be saved to: {report_path}")
 
@@ -82,10 +92,9 @@ def main():
         plugin = ReportPlugin(f)
         
         # Run pytest (suppress default output to keep console clean, or remove -q to see it)
-        exit_code = pytest.main([str(TEST_DIR), "-q"], plugins=[plugin])
+        exit_code = pytest.main([str(TEST_DIR), "-q", f"--junitxml={junit_path}"], plugins=[plugin])
         
         plugin.write_summary()
-        plugin.write_details()
 
     # 3. Console Summary
     print("\n" + "="*30)
@@ -94,6 +103,7 @@ def main():
     else:
         print(f"✅ SUCCESS: All {plugin.passed} tests passed!")
     print(f"📊 Detailed Report: {report_path}")
+    print(f"🧾 JUnit XML: {junit_path}")
     print("="*30 + "\n")
 
     sys.exit(exit_code)
@@ -10,7 +10,7 @@ AI4INFRA 인증서 관리 모듈 (리팩터링 버전)
 설계 원칙:
   - 각 함수는 단일 책임(SRP)을 유지한다.
   - 상위 함수(create_service_certificate)는 하위 단계를 orchestration 한다.
-  - OpenSSL 호출은 subprocess를 통해 수행한다.
+  - 키/CSR/인증서 생성·서명·검증은 cryptography 라이브러리로 프로세스 내에서 수행한다.
   - 경로 구조는 BASE_DIR 및 서비스 이름 기반으로 일관성을 유지한다.
   - 서비스별 key/cert 파일명은 최대한 통일한다.
     * private.key
@@ -22,28 +22,214 @@ AI4INFRA 인증서 관리 모듈 (리팩터링 버전)
   - 2025-11-20: 구조 개선, SAN 기본값 추가
   - 2025-11-20: 서비스별 파일명 통일(private.key/certificate.crt)
   - 2026-01-10: Bitwarden 제거 및 Vaultwarden/Nginx 지원 (간결화)
+  - 2026-10-16: openssl subprocess 호출 → cryptography 라이브러리(프로세스 내 처리)로 전환
+  - 2026-10-16: 서비스 키 기본값 ECDSA P-256 (RSA 는 호환 필요 서비스만)
+  - 2026-10-16: Root CA 키 기본값 ECDSA P-384 (CA_ALGO=rsa 로 RSA-4096 유지 가능)
 """
 
 # Standard library imports
 import os
+import hashlib
+import ipaddress
+import shutil
+import stat
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from functools import wraps
-import yaml
 
 # Third-party imports
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
 from dotenv import load_dotenv
 from common.logger import log_info, log_warn, log_error
 from common.load_config import load_config
-from common.load_config import load_config
 
 load_dotenv()
 PROJECT_ROOT = os.getenv("PROJECT_ROOT")
 BASE_DIR = os.getenv("BASE_DIR", "/opt/ai4infra")
-CA_DIR = Path(f"{BASE_DIR}/certs/ca")
+BASE_PATH = Path(BASE_DIR)  # 서비스별 경로 조합의 기준 (호출마다 Path 재생성 생략)
+CA_DIR = BASE_PATH / "certs" / "ca"
 CA_KEY = CA_DIR / "rootCA.key"
 CA_CERT = CA_DIR / "rootCA.pem"  # 전역 Root CA 인증서 (PEM)
+# Root CA 키 알고리즘: ecdsa(P-384 + SHA-384, 기본) / rsa(4096 + SHA-256, 호환 모드)
+# - 기존 CA는 재생성하지 않는 한 그대로 사용 (서명 해시는 CA 키 종류에 맞춰 선택)
+CA_ALGO = os.getenv("CA_ALGO", "ecdsa")
+
+CA_SUBJECT = x509.Name([
+    x509.NameAttribute(NameOID.COUNTRY_NAME, "KR"),
+    x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Seoul"),
+    x509.NameAttribute(NameOID.ORGANIZATION_NAME, "AI4INFRA"),
+    x509.NameAttribute(NameOID.COMMON_NAME, "AI4INFRA-Root-CA"),
+])
+
+# 서비스 키 알고리즘: 기본 ECDSA P-256 (키 생성이 RSA 소수 탐색 대비 수백 배 빠름)
+# - Ed25519 는 브라우저/TLS 서버 인증서 호환성이 없어 사용하지 않음
+# - 구형 클라이언트 호환이 필요한 서비스는 config/<service>.yml 의 cert.key_algo: "rsa" 로 RSA-2048 지정
+#   (예: ldap.yml, resolve_key_algorithm)
+SERVICE_KEY_ALGORITHM = "ecdsa"
+
+# 권한 정리 시 파일 분류 접미사 (key 판정이 우선, 나머지 crt/pem 은 인증서)
+_KEY_SUFFIXES = (".key", "key.pem")  # *_key.pem 포함
+_CERT_SUFFIXES = (".crt", ".pem")
+
+# 기존 서비스 인증서 재사용 조건: 만료까지 남은 일수 (이하이면 재발급)
+CERT_RENEW_DAYS = 30
+
+# 외부 명령 절대경로는 import 시 한 번만 탐색 (호출마다 PATH 검색 생략)
+# - cmd.exe 는 WSL interop 환경에서만 존재
+_CMD_EXE = shutil.which("cmd.exe") or "cmd.exe"
+
+
+# 이미 확인/생성한 디렉터리 (같은 프로세스에서 반복 mkdir 생략)
+_ensured_dirs: set[Path] = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """디렉터리 생성 (mkdir -p 와 동일, 프로세스 내 1회)"""
+    path = Path(path)
+    if path in _ensured_dirs:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(path)
+
+
+def _chmod_if_needed(path, mode: int) -> None:
+    """모드가 이미 같으면 chmod 생략 (재실행 시 inode ctime/저널 기록 없음, 심볼릭 링크는 건너뜀)"""
+    st = os.lstat(path)
+    if not stat.S_ISLNK(st.st_mode) and stat.S_IMODE(st.st_mode) != mode:
+        os.chmod(path, mode)
+
+
+def _tree_paths(root: Path):
+    """root 자신과 그 이하 모든 디렉터리/파일 경로 (심볼릭 링크 디렉터리는 따라가지 않음)"""
+    yield root
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            yield os.path.join(dirpath, name)
+
+
+def _chmod_tree(root: Path, mode: int) -> None:
+    """chmod -R 과 동일: root 이하 디렉터리/파일 모드 일괄 변경 (심볼릭 링크는 건너뜀)"""
+    for name in _tree_paths(root):
+        try:
+            _chmod_if_needed(name, mode)
+        except OSError:
+            pass  # 기존 chmod -R (check=False) 과 같이 개별 실패는 무시
+
+
+def _chown_tree(root: Path, uid: int, gid: int) -> int:
+    """
+    chown -R 과 동일: root 이하 소유권 일괄 변경 (심볼릭 링크는 링크 자체만, lchown)
+    - 이미 uid:gid 인 항목은 건너뜀, 개별 실패는 무시하고 실패 건수 반환
+    """
+    failed = 0
+    for name in _tree_paths(root):
+        try:
+            st = os.lstat(name)
+            if (st.st_uid, st.st_gid) != (uid, gid):
+                os.lchown(name, uid, gid)
+        except OSError:
+            failed += 1
+    return failed
+
+
+def _write_pem(path: Path, data: bytes, mode: int) -> None:
+    """
+    PEM 파일 기록 (key: 600, cert: 644)
+    - 생성 시점부터 지정 모드로 열고 fchmod 로 기존 파일/umask 영향 제거
+      → private key 가 잠시라도 644 로 노출되는 구간이 없음
+    """
+    _ensure_dir(path.parent)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        os.fchmod(fd, mode)
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+PrivateKey = rsa.RSAPrivateKey | ec.EllipticCurvePrivateKey
+
+
+def _sign_hash(key: PrivateKey) -> hashes.HashAlgorithm:
+    """서명 키에 맞는 해시 (P-384 → SHA-384, 그 외 SHA-256)"""
+    if isinstance(key, ec.EllipticCurvePrivateKey) and key.curve.key_size >= 384:
+        return hashes.SHA384()
+    return hashes.SHA256()
+
+
+def _key_pem(key: PrivateKey) -> bytes:
+    # openssl 3 genrsa/genpkey 기본 출력과 동일한 PKCS#8 (BEGIN PRIVATE KEY)
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+# Root CA 파싱 결과 캐시: (경로, mtime) 이 같으면 PEM 재파싱 생략 (재생성 시 자동 무효화)
+_ca_cache: dict[tuple, tuple[x509.Certificate, PrivateKey]] = {}
+
+
+def _load_ca() -> tuple[x509.Certificate, PrivateKey]:
+    """Root CA 인증서/키 로드 (프로세스 내 캐시)"""
+    cache_key = (str(CA_CERT), CA_CERT.stat().st_mtime_ns, str(CA_KEY), CA_KEY.stat().st_mtime_ns)
+    cached = _ca_cache.get(cache_key)
+    if cached is None:
+        cached = (
+            x509.load_pem_x509_certificate(CA_CERT.read_bytes()),
+            serialization.load_pem_private_key(CA_KEY.read_bytes(), password=None),
+        )
+        _ca_cache.clear()
+        _ca_cache[cache_key] = cached
+    return cached
+
+
+# 서명 검증 결과 캐시: (cert sha256, CA sha256) → 검증 통과
+# - 파일 내용이 바뀌면 키가 달라지므로 자동 무효화
+# - 유효기간은 시간에 따라 변하므로 캐시하지 않고 매번 확인
+_verify_cache: set[tuple[bytes, bytes]] = set()
+
+
+# 서비스 인증서 공통 부분(issuer, BasicConstraints, AKI)을 미리 채운 builder
+# - CertificateBuilder 는 불변 객체라 재사용해도 안전, CA가 바뀌면 다시 구성
+# - 키: _load_ca() 가 반환한 CA 인증서 객체 (참조를 보관하므로 동일성 비교가 안전)
+_builder_cache: dict[str, tuple[x509.Certificate, x509.CertificateBuilder]] = {}
+
+
+def _service_builder_base(ca_cert: x509.Certificate, ca_key: PrivateKey) -> x509.CertificateBuilder:
+    cached = _builder_cache.get("base")
+    if cached is not None and cached[0] is ca_cert:
+        return cached[1]
+    builder = (
+        x509.CertificateBuilder()
+        .issuer_name(ca_cert.subject)
+        .add_extension(x509.BasicConstraints(ca=False, path_length=None), critical=True)
+        .add_extension(
+            x509.AuthorityKeyIdentifier.from_issuer_public_key(ca_key.public_key()), critical=False
+        )
+    )
+    _builder_cache["base"] = (ca_cert, builder)
+    return builder
+
+
+def _parse_san(san: str) -> x509.SubjectAlternativeName:
+    """'DNS:a,DNS:b,IP:127.0.0.1' 형식의 SAN 문자열을 x509 확장으로 변환"""
+    names = []
+    for part in san.split(","):
+        kind, _, value = part.strip().partition(":")
+        if kind == "DNS":
+            names.append(x509.DNSName(value))
+        elif kind == "IP":
+            names.append(x509.IPAddress(ipaddress.ip_address(value)))
+        else:
+            raise ValueError(f"지원하지 않는 SAN 항목: {part}")
+    return x509.SubjectAlternativeName(names)
 
 
 def create_root_ca(overwrite: bool = False) -> bool:
@@ -52,40 +238,39 @@ def create_root_ca(overwrite: bool = False) -> bool:
             log_info(f"[create_root_ca] Root CA 이미 존재: {CA_CERT}")
             return True
 
-        subprocess.run(["mkdir", "-p", str(CA_DIR)], check=True)
-
-        log_info("[create_root_ca] Root CA private key 생성 중...")
-        subprocess.run(
-            ["openssl", "genrsa", "-out", str(CA_KEY), "4096"],
-            check=True,
-        )
+        log_info(f"[create_root_ca] Root CA private key({CA_ALGO}) 생성 중...")
+        if CA_ALGO == "rsa":
+            key = rsa.generate_private_key(public_exponent=65537, key_size=4096)
+        else:
+            key = ec.generate_private_key(ec.SECP384R1())
+        _write_pem(CA_KEY, _key_pem(key), 0o600)
 
         log_info("[create_root_ca] Root CA self-signed 인증서 생성 중...")
-        subprocess.run(
-            [
-                "openssl",
-                "req",
-                "-x509",
-                "-new",
-                "-nodes",
-                "-key",
-                str(CA_KEY),
-                "-sha256",
-                "-days",
-                "3650",
-                "-subj",
-                "/C=KR/ST=Seoul/O=AI4INFRA/CN=AI4INFRA-Root-CA",
-                "-out",
-                str(CA_CERT),
-            ],
-            check=True,
+        now = datetime.now(timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(CA_SUBJECT)
+            .issuer_name(CA_SUBJECT)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + timedelta(days=3650))
+            .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+            .add_extension(
+                x509.KeyUsage(
+                    digital_signature=False, content_commitment=False, key_encipherment=False,
+                    data_encipherment=False, key_agreement=False, key_cert_sign=True,
+                    crl_sign=True, encipher_only=False, decipher_only=False,
+                ),
+                critical=True,
+            )
+            .add_extension(x509.SubjectKeyIdentifier.from_public_key(key.public_key()), critical=False)
+            .sign(key, _sign_hash(key))
         )
+        _write_pem(CA_CERT, cert.public_bytes(serialization.Encoding.PEM), 0o644)
 
         log_info(f"[create_root_ca] Root CA 생성 완료 → {CA_CERT}")
         return True
-    except subprocess.CalledProcessError as e:
-        log_error(f"[create_root_ca] OpenSSL 호출 실패: {e}")
-        return False
     except Exception as e:
         log_error(f"[create_root_ca] 예외 발생: {e}")
         return False
@@ -97,19 +282,23 @@ def verify_root_ca() -> bool:
 
     try:
         log_info("[verify_root_ca] Root CA 인증서 분석 시작...")
-        result = subprocess.run(
-            ["openssl", "x509", "-in", str(CA_CERT), "-noout", "-text"],
-            capture_output=True,
-            text=True,
-            check=True,
+        cert = x509.load_pem_x509_certificate(CA_CERT.read_bytes())
+        # self-signed 서명 검증
+        cert.verify_directly_issued_by(cert)
+
+        preview = (
+            f"Subject: {cert.subject.rfc4514_string()}\n"
+            f"Issuer: {cert.issuer.rfc4514_string()}\n"
+            f"Serial: {cert.serial_number:x}\n"
+            f"Not Before: {cert.not_valid_before_utc}\n"
+            f"Not After : {cert.not_valid_after_utc}\n"
+            f"SHA256 Fingerprint: {cert.fingerprint(hashes.SHA256()).hex(':').upper()}"
         )
-
-        preview = result.stdout[:400]
         log_info(f"[verify_root_ca] Root CA 인증서 정보:\n{preview}")
         return True
 
-    except subprocess.CalledProcessError as e:
-        log_error(f"[verify_root_ca] OpenSSL 검증 실패: {e.stderr}")
+    except (ValueError, TypeError, InvalidSignature) as e:
+        log_error(f"[verify_root_ca] Root CA 검증 실패: {e}")
         return False
     except Exception as e:
         log_error(f"[verify_root_ca] 예외 발생: {e}")
@@ -126,16 +315,19 @@ def generate_root_ca_if_needed() -> bool:
     log_info("[generate_root_ca_if_needed] Root CA 없음 → 새로 생성합니다.")
     return create_root_ca(overwrite=False)
 
+@lru_cache(maxsize=32)
 def get_service_cert_paths(service: str) -> tuple[Path, Path, Path]:
-    base = Path(BASE_DIR) / service / "certs"
+    base = BASE_PATH / service / "certs"
     key_path = base / "private.key"
     csr_path = base / "request.csr"
     cert_path = base / "certificate.crt"
     return key_path, csr_path, cert_path
 
-def build_default_san(service: str) -> str:
+@lru_cache(maxsize=32)
+def build_default_san(service: str) -> x509.SubjectAlternativeName:
     """
-    서비스 이름을 기반으로 기본 SubjectAltName 문자열을 구성
+    서비스 이름을 기반으로 기본 SubjectAltName 확장을 구성 (문자열 재파싱 없음)
+    - 서비스명만으로 결정되는 불변 값 → 서비스별 1회만 생성
     예) postgres → DNS:postgres,DNS:ai4infra-postgres,IP:127.0.0.1
     """
     dns_entries = [
@@ -148,26 +340,26 @@ def build_default_san(service: str) -> str:
         "127.0.0.1",
     ]
 
-    san_parts = [f"DNS:{d}" for d in dns_entries] + [f"IP:{ip}" for ip in ip_entries]
-    return ",".join(san_parts)
+    return x509.SubjectAlternativeName(
+        [x509.DNSName(d) for d in dns_entries]
+        + [x509.IPAddress(ipaddress.ip_address(ip)) for ip in ip_entries]
+    )
 
-def create_service_key(service: str, key_path: Path) -> bool:
+def create_service_key(service: str, key_path: Path, algorithm: str = SERVICE_KEY_ALGORITHM) -> bool:
     """
     서비스 private key 생성
+    - algorithm: "ecdsa"(P-256, 기본) 또는 "rsa"(2048, 구형 클라이언트 호환용)
     """
     try:
-        key_dir = key_path.parent
-        subprocess.run(["mkdir", "-p", str(key_dir)], check=True)
-
-        subprocess.run(
-            ["openssl", "genrsa", "-out", str(key_path), "4096"],
-            check=True,
-        )
-        log_info(f"[create_service_key] {service} key 생성 완료: {key_path}")
+        if algorithm == "ecdsa":
+            key = ec.generate_private_key(ec.SECP256R1())
+        elif algorithm == "rsa":
+            key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        else:
+            raise ValueError(f"지원하지 않는 키 알고리즘: {algorithm}")
+        _write_pem(key_path, _key_pem(key), 0o600)
+        log_info(f"[create_service_key] {service} key({algorithm}) 생성 완료: {key_path}")
         return True
-    except subprocess.CalledProcessError as e:
-        log_error(f"[create_service_key] OpenSSL 호출 실패: {e}")
-        return False
     except Exception as e:
         log_error(f"[create_service_key] 예외 발생: {e}")
         return False
@@ -177,25 +369,17 @@ def create_service_csr(service: str, key_path: Path, csr_path: Path) -> bool:
     서비스 CSR 생성
     """
     try:
-        subprocess.run(
-            [
-                "openssl",
-                "req",
-                "-new",
-                "-key",
-                str(key_path),
-                "-out",
-                str(csr_path),
-                "-subj",
-                f"/C=KR/ST=Seoul/O=AI4INFRA/CN={service}.ai4infra.internal",
-            ],
-            check=True,
-        )
+        key = serialization.load_pem_private_key(key_path.read_bytes(), password=None)
+        subject = x509.Name([
+            x509.NameAttribute(NameOID.COUNTRY_NAME, "KR"),
+            x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Seoul"),
+            x509.NameAttribute(NameOID.ORGANIZATION_NAME, "AI4INFRA"),
+            x509.NameAttribute(NameOID.COMMON_NAME, f"{service}.ai4infra.internal"),
+        ])
+        csr = x509.CertificateSigningRequestBuilder().subject_name(subject).sign(key, hashes.SHA256())
+        _write_pem(csr_path, csr.public_bytes(serialization.Encoding.PEM), 0o644)
         log_info(f"[create_service_csr] {service} CSR 생성: {csr_path}")
         return True
-    except subprocess.CalledProcessError as e:
-        log_error(f"[create_service_csr] OpenSSL 호출 실패: {e}")
-        return False
     except Exception as e:
         log_error(f"[create_service_csr] 예외 발생: {e}")
         return False
@@ -204,83 +388,62 @@ def sign_service_cert_with_ca(
     service: str,
     csr_path: Path,
     cert_path: Path,
-    san: str,) -> bool:
+    san: x509.SubjectAlternativeName | str,) -> bool:
     """
-    CSR을 Root CA로 서명하여 서버 인증서 생성
+    CSR을 Root CA로 서명하여 서버 인증서 생성 (SAN은 x509 확장으로 직접 추가)
+    - san: SubjectAlternativeName 또는 'DNS:a,IP:b' 형식 문자열
     """
     try:
-        cert_dir = cert_path.parent
-        subprocess.run(["mkdir", "-p", str(cert_dir)], check=True)
-
-        with NamedTemporaryFile("w", delete=False, suffix=".cnf") as tmp:
-            tmp_path = Path(tmp.name)
-            tmp.write("[ req ]\n")
-            tmp.write("distinguished_name = req_distinguished_name\n")
-            tmp.write("req_extensions = v3_req\n")
-            tmp.write("[ req_distinguished_name ]\n")
-            tmp.write("[ v3_req ]\n")
-            tmp.write(f"subjectAltName = {san}\n")
+        if isinstance(san, str):
+            san = _parse_san(san)
+        csr = x509.load_pem_x509_csr(csr_path.read_bytes())
+        ca_cert, ca_key = _load_ca()
 
+        san_desc = ",".join(str(name.value) for name in san)
         log_info(
-            f"[sign_service_cert_with_ca] {service} cert CA 서명 (SAN={san}) → {cert_path}"
+            f"[sign_service_cert_with_ca] {service} cert CA 서명 (SAN={san_desc}) → {cert_path}"
         )
 
-        subprocess.run(
-            [
-                "openssl",
-                "x509",
-                "-req",
-                "-in",
-                str(csr_path),
-                "-CA",
-                str(CA_CERT),
-                "-CAkey",
-                str(CA_KEY),
-                "-CAcreateserial",
-                "-out",
-                str(cert_path),
-                "-days",
-                "365",
-                "-sha256",
-                "-extensions",
-                "v3_req",
-                "-extfile",
-                str(tmp_path),
-            ],
-            check=True,
+        now = datetime.now(timezone.utc)
+        cert = (
+            _service_builder_base(ca_cert, ca_key)
+            .subject_name(csr.subject)
+            .public_key(csr.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now)
+            .not_valid_after(now + timedelta(days=365))
+            .add_extension(san, critical=False)
+            .sign(ca_key, _sign_hash(ca_key))
         )
-
-        tmp_path.unlink(missing_ok=True)
+        _write_pem(cert_path, cert.public_bytes(serialization.Encoding.PEM), 0o644)
         return True
 
-    except subprocess.CalledProcessError as e:
-        log_error(f"[sign_service_cert_with_ca] OpenSSL 호출 실패: {e}")
-        return False
     except Exception as e:
         log_error(f"[sign_service_cert_with_ca] 예외 발생: {e}")
         return False
 
 def verify_service_cert(service: str, cert_path: Path) -> bool:
     """
-    서비스 인증서를 Root CA로 검증
+    서비스 인증서를 Root CA로 검증 (서명 + 유효기간)
     """
     try:
-        result = subprocess.run(
-            [
-                "openssl",
-                "verify",
-                "-CAfile",
-                str(CA_CERT),
-                str(cert_path),
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-        log_info(f"[verify_service_cert] OK: {result.stdout.strip()}")
+        cert_pem = Path(cert_path).read_bytes()
+        cert = x509.load_pem_x509_certificate(cert_pem)
+        cache_key = (hashlib.sha256(cert_pem).digest(), hashlib.sha256(CA_CERT.read_bytes()).digest())
+        if cache_key not in _verify_cache:
+            ca_cert, _ = _load_ca()
+            cert.verify_directly_issued_by(ca_cert)
+            _verify_cache.add(cache_key)
+
+        now = datetime.now(timezone.utc)
+        if not (cert.not_valid_before_utc <= now <= cert.not_valid_after_utc):
+            log_error(f"[verify_service_cert] 검증 실패: 유효기간 밖의 인증서 ({cert_path})")
+            return False
+
+        log_info(f"[verify_service_cert] OK: {cert_path}")
         return True
-    except subprocess.CalledProcessError as e:
-        log_error(f"[verify_service_cert] 검증 실패: {e.stderr.strip()}")
+    except (ValueError, TypeError, InvalidSignature) as e:
+        log_error(f"[verify_service_cert] 검증 실패: {e}")
         return False
     except Exception as e:
         log_error(f"[verify_service_cert] 예외 발생: {e}")
@@ -290,33 +453,52 @@ def deploy_root_ca_to_service(service: str, ca_src: Path) -> bool:
     """
     서비스 디렉터리 내부 certs/에 Root CA 복사
     - 기본 파일명: rootCA.crt
+    - shutil.copy2 (cp -a 와 같이 mode/mtime 보존), 크기·mtime 이 같으면 복사 생략
     """
     try:
-        cert_dir = Path(BASE_DIR) / service / "certs"
-        subprocess.run(["mkdir", "-p", str(cert_dir)], check=True)
+        cert_dir = BASE_PATH / service / "certs"
+        _ensure_dir(cert_dir)
         dst = cert_dir / "rootCA.crt"
 
-        subprocess.run(
-            ["cp", "-a", str(ca_src), str(dst)],
-            check=True,
-        )
+        src_stat = os.stat(ca_src)
+        try:
+            dst_stat = os.stat(dst)
+            if (dst_stat.st_size, dst_stat.st_mtime_ns) == (src_stat.st_size, src_stat.st_mtime_ns):
+                log_info(f"[deploy_root_ca_to_service] Root CA 최신 상태 유지: {dst}")
+                return True
+        except FileNotFoundError:
+            pass
+
+        shutil.copy2(ca_src, dst)
         log_info(f"[deploy_root_ca_to_service] Root CA 복사 완료: {dst}")
         return True
-    except subprocess.CalledProcessError as e:
+    except OSError as e:
         log_error(f"[deploy_root_ca_to_service] 복사 실패: {e}")
         return False
     except Exception as e:
         log_error(f"[deploy_root_ca_to_service] 예외 발생: {e}")
         return False
 
-def resolve_cert_paths(service: str) -> dict:
+@lru_cache(maxsize=64)
+def _load_service_cfg_cached(cfg_path: str, mtime_ns: int) -> dict:
+    return load_config(cfg_path) or {}
+
+
+def _load_service_cfg(service: str) -> dict:
     """
-    인증서 경로를 일원화하여 반환합니다.
+    config/<service>.yml 전체 로드 (YAML 파싱은 파일 mtime 기준 캐시 → 수정 시 자동 재로드)
+    - 반환 dict 는 공유 객체이므로 읽기 전용으로 사용
+    - 파일이 없으면 FileNotFoundError
     """
     cfg_path = f"{PROJECT_ROOT}/config/{service}.yml"
+    return _load_service_cfg_cached(cfg_path, os.stat(cfg_path).st_mtime_ns)
 
+def resolve_cert_paths(service: str) -> dict:
+    """
+    인증서 경로를 일원화하여 반환합니다.
+    """
     try:
-        path_cfg = load_config(cfg_path, section="path") or {}
+        path_cfg = _load_service_cfg(service).get("path") or {}
     except Exception:
         path_cfg = {}
 
@@ -325,7 +507,7 @@ def resolve_cert_paths(service: str) -> dict:
     files = path_cfg.get("files", {})
 
     # cert_dir 결정
-    cert_dir = Path(dirs.get("certs", f"{BASE_DIR}/{service}/certs"))
+    cert_dir = Path(dirs["certs"]) if "certs" in dirs else BASE_PATH / service / "certs"
 
     # 파일명 결정 (기본값 제공)
     return {
@@ -335,11 +517,36 @@ def resolve_cert_paths(service: str) -> dict:
         "root_ca": cert_dir / files.get("root_ca", "rootCA.crt"),
     }
 
+def resolve_key_algorithm(service: str) -> str:
+    """
+    서비스 키 알고리즘 결정
+      1) config/<service>.yml 의 cert.key_algo ("ecdsa" | "rsa")
+      2) 미지정 시 SERVICE_KEY_ALGORITHM
+    """
+    try:
+        cert_cfg = _load_service_cfg(service).get("cert") or {}
+    except Exception:
+        cert_cfg = {}
+    return cert_cfg.get("key_algo", SERVICE_KEY_ALGORITHM)
+
+def _cert_matches(
+    cert_path: Path, want_san: x509.SubjectAlternativeName, min_days_left: int = CERT_RENEW_DAYS
+) -> bool:
+    """기존 인증서의 SAN 이 요청과 같고 만료까지 min_days_left 일 이상 남았는지"""
+    try:
+        cert = x509.load_pem_x509_certificate(Path(cert_path).read_bytes())
+        have_san = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName).value
+    except (OSError, ValueError, x509.ExtensionNotFound):
+        return False
+    days_left = cert.not_valid_after_utc - datetime.now(timezone.utc)
+    return set(have_san) == set(want_san) and days_left > timedelta(days=min_days_left)
+
+
 def create_service_certificate(service: str, san: str | None = None) -> bool:
     """
     서비스 인증서 생성:
       1) 경로는 resolve_cert_paths()에서 일원화
-      2) key → csr → crt 순 생성
+      2) key → csr → crt 순 생성 (기존 인증서가 SAN 일치 + 만료 여유 시 재사용)
       3) rootCA 복사는 deploy_root_ca_to_service()가 전담
     """
     try:
@@ -349,16 +556,19 @@ def create_service_certificate(service: str, san: str | None = None) -> bool:
         csr_path = paths["csr"]
         cert_path = paths["crt"]
 
-        # 2) 이미 key + cert 존재하면 skip
-        if os.path.exists(key_path) and os.path.exists(cert_path):
-            deploy_root_ca_to_service(service, CA_CERT)
-            return True
+        # 2) SAN 결정
+        san_value = _parse_san(san) if san else build_default_san(service)
 
-        # 3) SAN 결정
-        san_value = san or build_default_san(service)
+        # 3) 기존 key + cert 가 SAN 일치 + 유효기간 여유가 있으면 재발급 skip
+        if os.path.exists(key_path) and os.path.exists(cert_path):
+            if _cert_matches(cert_path, san_value):
+                deploy_root_ca_to_service(service, CA_CERT)
+                return True
+            log_info(f"[create_service_certificate] {service} 인증서 SAN 변경/만료 임박 → 재발급")
 
         # 4) key / csr / crt 생성
-        if not create_service_key(service, key_path):
+        algorithm = resolve_key_algorithm(service)
+        if not create_service_key(service, key_path, algorithm):
             return False
 
         if not create_service_csr(service, key_path, csr_path):
@@ -380,6 +590,32 @@ def create_service_certificate(service: str, san: str | None = None) -> bool:
         log_error(f"[create_service_certificate] {e}")
         return False
 
+def create_service_certificates(services: list[str], workers: int | None = None) -> dict[str, bool]:
+    """
+    여러 서비스 인증서를 병렬 생성 (키 생성/서명은 CPU 작업 → 프로세스 풀)
+    - 서비스별 결과: {service: 성공 여부}
+    - workers: 프로세스 수 (기본: CPU 수 - 1, 서비스 수 이하), 1이면 풀 없이 순차 실행
+    - Root CA는 fan-out 전에 부모 프로세스에서 한 번만 확인/생성 (worker 간 경쟁 방지)
+    """
+    services = list(services)
+    if not generate_root_ca_if_needed():
+        return {svc: False for svc in services}
+
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 2) - 1)
+    workers = min(len(services), workers)
+    if workers <= 1:
+        # 단일 CPU/단일 서비스: 프로세스 기동 비용 없이 순차 처리
+        results = {svc: create_service_certificate(svc) for svc in services}
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            results = dict(zip(services, ex.map(create_service_certificate, services)))
+
+    failed = [svc for svc, ok in results.items() if not ok]
+    if failed:
+        log_warn(f"[create_service_certificates] 인증서 생성 실패: {failed}")
+    return results
+
 def apply_service_permissions(service: str) -> bool:
     """
     서비스별 권한(User/Group) 및 파일 모드(600/644/700) 일괄 적용
@@ -390,8 +626,7 @@ def apply_service_permissions(service: str) -> bool:
       - 기본: root:root (0:0)
     """
     try:
-        cfg_path = f"{PROJECT_ROOT}/config/{service}.yml"
-        cfg = load_config(cfg_path) 
+        cfg = _load_service_cfg(service) 
         
         # [UID/GID Mapping] 
         # 서비스별로 필요한 UID/GID가 있다면 여기서 설정
@@ -408,63 +643,57 @@ def apply_service_permissions(service: str) -> bool:
 
         # Mode Settings
         mode_map = {
-            "data": "700",  # User only
-            "key": "600",   # User read/write
-            "cert": "644",  # World readable
-            "script": "755" # Executable
+            "data": 0o700,  # User only
+            "key": 0o600,   # User read/write
+            "cert": 0o644,  # World readable
+            "script": 0o755 # Executable
         }
 
-        service_dir = Path(BASE_DIR) / service
+        service_dir = BASE_PATH / service
         path_cfg = cfg.get("path", {})
         dirs = path_cfg.get("directories", {})
 
         # 1) 주요 디렉터리 경로
-        data_dir = Path(dirs.get("data", f"{service_dir}/data"))
-        cert_dir = Path(dirs.get("certs", f"{service_dir}/certs"))
+        data_dir = Path(dirs["data"]) if "data" in dirs else service_dir / "data"
+        cert_dir = Path(dirs["certs"]) if "certs" in dirs else service_dir / "certs"
 
         # [Auto-Create] Data 디렉터리가 없으면 생성 (Docker 자동 생성 시 root 소유 되는 문제 방지)
-        if not os.path.exists(data_dir):
-            subprocess.run(["mkdir", "-p", str(data_dir)], check=False)
+        _ensure_dir(data_dir)
         
         # [Special Case] ELK는 하위 데이터 폴더까지 미리 생성해야 함
         if service == "elk":
             for sub in ["elasticsearch", "logstash", "filebeat"]:
-                sub_path = data_dir / sub
-                if not os.path.exists(sub_path):
-                    subprocess.run(["mkdir", "-p", str(sub_path)], check=False)
+                _ensure_dir(data_dir / sub)
 
         # 2) 서비스 루트 소유권 변경
         if service_dir.exists():
-            subprocess.run(["chown", "-R", f"{uid}:{gid}", str(service_dir)], check=False)
+            failed = _chown_tree(service_dir, uid, gid)
+            if failed:
+                log_warn(f"[apply_service_permissions] 소유권 변경 실패 {failed}건 (root 권한 필요) → {service_dir}")
             log_info(f"[apply_service_permissions] 소유권 변경 → {service_dir} ({uid}:{gid})")
 
         # 3) Data 디렉터리 권한 (700)
         if os.path.exists(data_dir):
-            subprocess.run(["chmod", "-R", mode_map["data"], str(data_dir)], check=False)
-            log_info(f"[apply_service_permissions] data 권한({mode_map['data']}) 적용 → {data_dir}")
+            _chmod_tree(data_dir, mode_map["data"])
+            log_info(f"[apply_service_permissions] data 권한({mode_map['data']:o}) 적용 → {data_dir}")
 
         # 4) Cert 디렉터리 권한
         if os.path.exists(cert_dir):
-            # Private Keys (600)
-            key_patterns = ["*.key", "*key.pem", "*_key.pem"]
-            key_paths = set()
-            for pat in key_patterns:
-                for p in Path(cert_dir).rglob(pat):
-                    key_paths.add(p)
-                    subprocess.run(["chmod", mode_map["key"], str(p)], check=False)
-            
-            # Certificates (644) - anything ending in crt/pem excluding keys
-            cert_patterns = ["*.crt", "*.pem"]
-            for pat in cert_patterns:
-                for p in Path(cert_dir).rglob(pat):
-                    if p not in key_paths:
-                        subprocess.run(["chmod", mode_map["cert"], str(p)], check=False)
+            # 한 번의 순회로 분류 (패턴별 rglob 5회 → os.walk 1회)
+            # - Private Keys (600): *.key, *key.pem
+            # - Certificates (644): 나머지 *.crt, *.pem
+            for dirpath, _, filenames in os.walk(cert_dir):
+                for name in filenames:
+                    if name.endswith(_KEY_SUFFIXES):
+                        _chmod_if_needed(os.path.join(dirpath, name), mode_map["key"])
+                    elif name.endswith(_CERT_SUFFIXES):
+                        _chmod_if_needed(os.path.join(dirpath, name), mode_map["cert"])
 
             log_info(f"[apply_service_permissions] 인증서 파일 권한(Key:600, Cert:644) 정리 완료")
 
         # 5) 실행 스크립트 권한 (755)
         for script in Path(service_dir).rglob("*.sh"):
-            subprocess.run(["chmod", mode_map["script"], str(script)], check=False)
+            _chmod_if_needed(script, mode_map["script"])
             log_info(f"[apply_service_permissions] 스크립트 권한(755) 적용 → {script}")
 
         log_info(f"[apply_service_permissions] {service} 권한 정리 완료")
@@ -474,6 +703,35 @@ def apply_service_permissions(service: str) -> bool:
         log_error(f"[apply_service_permissions] 예외 발생: {e}")
         return False
 
+@lru_cache(maxsize=1)
+def _win_userprofile() -> str:
+    """
+    Windows %USERPROFILE% 경로 (예: C:/Users/ben) - 프로세스 내 1회만 조회
+      1) 환경변수 USERPROFILE (WSLENV 로 공유된 경우, /p 변환 경로도 처리)
+      2) wslvar USERPROFILE (wslu 설치 시)
+      3) cmd.exe /c echo %USERPROFILE% (CMD 출력 = cp949)
+    """
+    value = os.environ.get("USERPROFILE", "")
+    if value.startswith("/mnt/") and len(value) > 6:
+        # WSLENV=USERPROFILE/p → /mnt/c/Users/ben 형식
+        value = f"{value[5].upper()}:{value[6:]}"
+    if not value:
+        wslvar = shutil.which("wslvar")
+        if wslvar:
+            result = subprocess.run(
+                [wslvar, "USERPROFILE"], stdin=subprocess.DEVNULL, capture_output=True, text=True
+            )
+            value = result.stdout.strip() if result.returncode == 0 else ""
+    if not value:
+        raw = subprocess.check_output(
+            [_CMD_EXE, "/c", "echo %USERPROFILE%"],
+            stdin=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,  # UNC 경고 숨김
+        )
+        value = raw.decode("cp949").strip()
+    return value.replace("\\", "/")
+
+
 def install_root_ca_windows():
     """
     WSL에서 생성한 Root CA를 Windows 신뢰 저장소에 설치
@@ -484,14 +742,9 @@ def install_root_ca_windows():
         print("[ERROR] Root CA 파일이 존재하지 않습니다:", root_ca_path)
         return False
 
-    # Windows %USERPROFILE% 가져오기 (CMD 출력 = cp949)
+    # Windows %USERPROFILE% 가져오기
     try:
-        win_home_raw = subprocess.check_output(
-            ["cmd.exe", "/c", "echo %USERPROFILE%"],
-            stderr=subprocess.DEVNULL,  # UNC 경고 숨김
-        )
-        win_home = win_home_raw.decode("cp949").strip()
-        win_home = win_home.replace("\\", "/")
+        win_home = _win_userprofile()
     except Exception as e:
         print(f"[ERROR] USERPROFILE 경로를 가져오지 못했습니다: {e}")
         return False
@@ -505,23 +758,21 @@ def install_root_ca_windows():
     # certutil로 Root CA를 신뢰 저장소에 추가
     try:
         result = subprocess.run(
-            ["cmd.exe", "/c", f'certutil -addstore "Root" "{target}"'],
+            [_CMD_EXE, "/c", f'certutil -addstore "Root" "{target}"'],
+            stdin=subprocess.DEVNULL,
             capture_output=True,
         )
-        stdout = result.stdout.decode("cp949", errors="ignore")
-        stderr = result.stderr.decode("cp949", errors="ignore")
-
-        print("[INFO] certutil stdout:")
-        print(stdout)
-        print("[INFO] certutil stderr:")
-        print(stderr)
-
         if result.returncode == 0:
             print("[SUCCESS] Windows Trusted Root Store에 Root CA 설치 완료")
             return True
-        else:
-            print("[ERROR] Root CA 설치 실패")
-            return False
+
+        # 실패 시에만 출력 디코딩 (certutil 오류 메시지는 주로 stdout, cp949)
+        print("[ERROR] Root CA 설치 실패")
+        print("[INFO] certutil stdout:")
+        print(result.stdout.decode("cp949", errors="replace"))
+        print("[INFO] certutil stderr:")
+        print(result.stderr.decode("cp949", errors="replace"))
+        return False
 
     except Exception as e:
         print(f"[ERROR] certutil 실행 중 예외 발생: {e}")
@@ -10,7 +10,7 @@ from dotenv import load_dotenv
 
 from common.load_config import load_config
 from common.logger import log_debug, log_error, log_info, log_warn
-from common.sudo_helpers import sudo_exists
+from common.sudo_helpers import SUDO, sudo_exists
 from utils.container.installer import discover_services
 from utils.container.crypto_manager import encrypt_file, decrypt_file
 
@@ -20,6 +20,13 @@ BASE_DIR = os.getenv('BASE_DIR', '/opt/ai4infra')
 
 
 
+def _is_writable(path: str) -> bool:
+    """path(또는 존재하는 가장 가까운 상위 디렉터리)에 현재 사용자가 쓸 수 있는지 확인"""
+    p = Path(path)
+    while not p.exists() and p != p.parent:
+        p = p.parent
+    return os.access(p, os.W_OK)
+
 def _run_hook_postgres(service: str, backup_root: str) -> str:
     """Postgres 전용 백업 훅: pg_dump 실행"""
     dump_file = f"{backup_root}/{service}_dump.sql"
@@ -30,7 +37,7 @@ def _run_hook_postgres(service: str, backup_root: str) -> str:
     # docker exec로 pg_dump 실행
     # (주의: 컨테이너 내부 유저는 postgres여야 함)
     cmd = [
-        'sudo', 'docker', 'exec', 'ai4infra-postgres',
+        *SUDO, 'docker', 'exec', 'ai4infra-postgres',
         'pg_dump', '-U', 'postgres', 'postgres'
     ]
     
@@ -56,7 +63,7 @@ def _run_hook_vault(service: str, backup_root: str) -> str:
     # (Vault 토큰이 환경변수나 파일에 있어야 함. 여기서는 로컬 루트 토큰 가정 또는 에러 처리 필요)
     # 실제 운영 환경에서는 별도 인증 처리가 필요할 수 있음.
     cmd = [
-        'sudo', 'docker', 'exec', '-e', 'VAULT_ADDR=https://127.0.0.1:8200', 'ai4infra-vault',
+        *SUDO, 'docker', 'exec', '-e', 'VAULT_ADDR=https://127.0.0.1:8200', 'ai4infra-vault',
         'vault', 'operator', 'raft', 'snapshot', 'save', 
         f"/tmp/vault.snap"  # 컨테이너 내부 경로
     ]
@@ -65,7 +72,7 @@ def _run_hook_vault(service: str, backup_root: str) -> str:
         subprocess.run(cmd, check=True)
         
         # 컨테이너 내부 파일을 호스트로 복사
-        cp_cmd = ['sudo', 'docker', 'cp', 'ai4infra-vault:/tmp/vault.snap', snapshot_file]
+        cp_cmd = [*SUDO, 'docker', 'cp', 'ai4infra-vault:/tmp/vault.snap', snapshot_file]
         subprocess.run(cp_cmd, check=True)
         
         log_info(f"[backup_hook] Vault 스냅샷 완료: {snapshot_file}")
@@ -89,7 +96,7 @@ def _run_restore_hook_postgres(service: str, extract_dir: str) -> bool:
     # DB 초기화 후 데이터 로드
     # 여기서는 간단히 psql < dump_file 실행
     cmd = [
-        'sudo', 'docker', 'exec', '-i', 'ai4infra-postgres',
+        *SUDO, 'docker', 'exec', '-i', 'ai4infra-postgres',
         'psql', '-U', 'postgres', 'postgres'
     ]
     
@@ -111,11 +118,11 @@ def _run_restore_hook_vault(service: str, extract_dir: str) -> bool:
     log_info(f"[restore_hook] Vault 스냅샷 리스토어 시작 (Force)...")
     
     # 컨테이너 내부로 파일 복사
-    subprocess.run(['sudo', 'docker', 'cp', snapshot_file, 'ai4infra-vault:/tmp/restore.snap'], check=True)
+    subprocess.run([*SUDO, 'docker', 'cp', snapshot_file, 'ai4infra-vault:/tmp/restore.snap'], check=True)
     
     # Force Restore
     cmd = [
-        'sudo', 'docker', 'exec', 'ai4infra-vault',
+        *SUDO, 'docker', 'exec', 'ai4infra-vault',
         'vault', 'operator', 'raft', 'snapshot', 'restore', '-force',
         '/tmp/restore.snap'
     ]
@@ -223,7 +230,7 @@ def backup_data(service: str, method_override: str = None) -> str:
         # Config Override 확인 (already loaded cfg)
         # Note: 이전 코드에서 불필요하게 cfg를 로드하던 부분 제거 (data_dir 표준 경로 사용)
         if sudo_exists(src_dir):
-            subprocess.run(['sudo', 'cp', '-a', src_dir, f"{temp_root}/data"], check=True)
+            subprocess.run([*SUDO, 'cp', '-a', src_dir, f"{temp_root}/data"], check=True)
             data_collected = True
         else:
             log_info(f"[backup_data] {service}: 데이터 디렉터리 없음 (Skip)")
@@ -240,7 +247,7 @@ def backup_data(service: str, method_override: str = None) -> str:
     # temp_root 내용을 압축
     try:
         subprocess.run(
-            ['sudo', 'tar', '-czf', tar_file, '-C', temp_root, '.'],
+            [*SUDO, 'tar', '-czf', tar_file, '-C', temp_root, '.'],
             check=True
         )
     except Exception as e:
@@ -252,7 +259,7 @@ def backup_data(service: str, method_override: str = None) -> str:
     # 3. 암호화 (GPG)
     # ---------------------------------------------
     final_file = f"{backup_dir}/{service}_{timestamp}.tar.gz.gpg"
-    subprocess.run(['sudo', 'mkdir', '-p', backup_dir], check=True)
+    subprocess.run([*SUDO, 'mkdir', '-p', backup_dir], check=True)
     
     log_info(f"[backup_data] 암호화 진행 중...")
     success = encrypt_file(tar_file, final_file, BACKUP_PASSWORD)
@@ -260,8 +267,8 @@ def backup_data(service: str, method_override: str = None) -> str:
     # ---------------------------------------------
     # 4. 정리
     # ---------------------------------------------
-    subprocess.run(['sudo', 'rm', '-rf', temp_root], check=True)
-    subprocess.run(['sudo', 'rm', '-f', tar_file], check=True)
+    subprocess.run([*SUDO, 'rm', '-rf', temp_root], check=True)
+    subprocess.run([*SUDO, 'rm', '-f', tar_file], check=True)
     
     if success:
         log_info(f"[backup_data] {service} 보안 백업 완료: {final_file}")
@@ -354,18 +361,37 @@ def restore_data(service: str, backup_path: str) -> bool:
             except:
                 pass
             
-            subprocess.run(['sudo', 'mkdir', '-p', dst_dir], check=True)
-            # rsync로 내용물 동기화
-            subprocess.run(['sudo', 'rsync', '-a', f"{src_data}/", f"{dst_dir}/"], check=True)
-            log_info(f"[restore_data] 데이터 파일 복원 완료")
-            success = True
+            copied = False
+            if _is_writable(dst_dir):
+                # 사용자 소유 BASE_DIR: sudo/rsync 없이 프로세스 내에서 복사
+                # (소유권은 복원 후 apply_service_permissions에서 재적용)
+                try:
+                    os.makedirs(dst_dir, exist_ok=True)
+                    shutil.copytree(src_data, dst_dir, symlinks=True, dirs_exist_ok=True)
+                    copied = True
+                except (PermissionError, shutil.Error) as e:
+                    # 하위에 root 소유 컨테이너 데이터가 있는 경우 → sudo rsync로 재시도
+                    log_warn(f"[restore_data] 직접 복사 실패, sudo rsync로 재시도: {e}")
+
+            if not copied:
+                try:
+                    subprocess.run([*SUDO, 'mkdir', '-p', dst_dir], check=True)
+                    # rsync로 내용물 동기화
+                    subprocess.run([*SUDO, 'rsync', '-a', f"{src_data}/", f"{dst_dir}/"], check=True)
+                    copied = True
+                except subprocess.CalledProcessError as e:
+                    log_error(f"[restore_data] 데이터 파일 복원 실패: {e}")
+
+            if copied:
+                log_info(f"[restore_data] 데이터 파일 복원 완료")
+                success = True
         else:
             log_error(f"[restore_data] 백업 내 data 폴더를 찾을 수 없습니다.")
 
     # ---------------------------------------------
     # 4. 정리
     # ---------------------------------------------
-    subprocess.run(['sudo', 'rm', '-f', temp_tar], check=True)
-    subprocess.run(['sudo', 'rm', '-rf', temp_extract_root], check=True)
+    subprocess.run([*SUDO, 'rm', '-f', temp_tar], check=True)
+    subprocess.run([*SUDO, 'rm', '-rf', temp_extract_root], check=True)
     
     return success
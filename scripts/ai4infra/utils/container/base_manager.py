@@ -13,21 +13,43 @@ load_dotenv()
 PROJECT_ROOT = os.getenv("PROJECT_ROOT")
 BASE_DIR = os.getenv('BASE_DIR', '/opt/ai4infra')
 
+# docker ps 결과 캐시 (CLI 1회 실행 동안 재사용, start/stop 시 무효화)
+_running_containers = None
+
+
+def running_containers(refresh: bool = False):
+    """
+    실행 중인 컨테이너 이름 집합 반환
+    - docker ps는 1회만 호출하고 결과를 캐시한다.
+    - docker ps 실패 시 None 반환 (캐시하지 않음)
+    """
+    global _running_containers
+    if _running_containers is None or refresh:
+        result = subprocess.run(
+            ['docker', 'ps', '--format', '{{.Names}}'],
+            capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            log_error(f"[running_containers] docker ps 실패: {result.stderr.strip()}")
+            return None
+        _running_containers = frozenset(result.stdout.split())
+    return _running_containers
+
+
+def invalidate_running_containers():
+    """컨테이너 상태가 바뀌었을 때 docker ps 캐시 무효화"""
+    global _running_containers
+    _running_containers = None
+
 
 def stop_container(search_pattern: str) -> bool:
     """name 필터 패턴으로 일치하는 Docker 컨테이너를 중지"""
 
-    cmd = [
-        'docker', 'ps',
-        '--filter', f'name={search_pattern}',
-        '--format', '{{.Names}}'
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        log_error(f"[stop_container] docker ps 실패: {result.stderr.strip()}")
+    running = running_containers()
+    if running is None:
         return False
 
-    containers = [c for c in result.stdout.strip().split('\n') if c]
+    containers = sorted(c for c in running if search_pattern in c)
     if not containers:
         log_info(f"[stop_container] {search_pattern}: 실행 중인 컨테이너 없음")
         return True
@@ -39,6 +61,7 @@ def stop_container(search_pattern: str) -> bool:
         else:
             log_error(f"[stop_container] {c} 중지 실패: {result.stderr.strip()}")
 
+    invalidate_running_containers()
     return True
 
 def copy_template(service: str) -> bool:
@@ -150,6 +173,7 @@ def start_container(service: str):
     log_debug(f"[start_container] 작업 디렉터리: {service_dir}")
 
     result = subprocess.run(cmd, cwd=service_dir, capture_output=True, text=True)
+    invalidate_running_containers()
     log_debug(f"[start_container] 반환코드: {result.returncode}")
 
     if result.returncode == 0:
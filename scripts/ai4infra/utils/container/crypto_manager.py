@@ -4,6 +4,7 @@ import os
 import subprocess
 from pathlib import Path
 from common.logger import log_debug, log_error, log_info
+from common.sudo_helpers import SUDO
 
 def encrypt_file(input_file: str, output_file: str, passphrase: str) -> bool:
     """
@@ -21,7 +22,7 @@ def encrypt_file(input_file: str, output_file: str, passphrase: str) -> bool:
     # --symmetric: 대칭키 암호화
     # --cipher-algo AES256: 강력한 알고리즘 지정
     cmd = [
-        'sudo', 'gpg', '--batch', '--yes',
+        *SUDO, 'gpg', '--batch', '--yes',
         '--passphrase-fd', '0',
         '--symmetric',
         '--cipher-algo', 'AES256',
@@ -55,7 +56,7 @@ def decrypt_file(input_file: str, output_file: str, passphrase: str) -> bool:
         return False
 
     cmd = [
-        'sudo', 'gpg', '--batch', '--yes',
+        *SUDO, 'gpg', '--batch', '--yes',
         '--passphrase-fd', '0',
         '--decrypt',
         '--output', output_file,
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 
 import os
+import shutil
 import subprocess
 
 from dotenv import load_dotenv
 
-from common.logger import log_debug, log_error, log_info
+from common.logger import log_debug, log_error, log_info, log_warn
+from common.sudo_helpers import SUDO
 
 load_dotenv()
 PROJECT_ROOT = os.getenv("PROJECT_ROOT")
@@ -18,30 +20,47 @@ def setup_usb_secrets() -> bool:
     
     try:
         # 마운트 포인트 생성
-        cmd = ['sudo', 'mkdir', '-p', usb_dir]
+        cmd = [*SUDO, 'mkdir', '-p', usb_dir]
         subprocess.run(cmd, check=True, capture_output=True, text=True)
         log_debug(f"[setup_usb_secrets] {usb_dir} 디렉터리 생성 완료")
         
         # USB 디렉터리가 비어있는지 확인
-        cmd = ['sudo', 'ls', '-A', usb_dir]
+        cmd = [*SUDO, 'ls', '-A', usb_dir]
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         is_empty = not result.stdout.strip()
         
         if is_empty:
             # 템플릿 복사 (실제 USB 미마운트 시)
-            cmd = ['sudo', 'cp', '-a', f"{template_usb}/.", usb_dir]
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            copied = False
+            if os.access(usb_dir, os.W_OK):
+                # 쓰기 가능한 마운트 포인트: sudo cp 없이 프로세스 내에서 복사 (cp -a 와 같이 링크 유지)
+                try:
+                    shutil.copytree(template_usb, usb_dir, symlinks=True, dirs_exist_ok=True)
+                    copied = True
+                except (PermissionError, shutil.Error) as e:
+                    # 하위에 root 소유 파일이 있는 경우 → sudo cp 로 재시도
+                    log_warn(f"[setup_usb_secrets] 직접 복사 실패, sudo cp로 재시도: {e}")
+            if not copied:
+                cmd = [*SUDO, 'cp', '-a', f"{template_usb}/.", usb_dir]
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
             log_info(f"[setup_usb_secrets] USB 템플릿 복사 완료 → {usb_dir}")
             
             # 권한 설정 (600: 소유자만 읽기/쓰기)
-            cmd = ['sudo', 'find', usb_dir, '-name', '*.enc', '-exec', 'chmod', '600', '{}', ';']
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
+            if os.geteuid() == 0 or os.access(usb_dir, os.W_OK):
+                # root(또는 직접 복사한 경우): find/chmod 프로세스 없이 os.walk + os.chmod
+                for root, _, files in os.walk(usb_dir):
+                    for name in files:
+                        if name.endswith('.enc'):
+                            os.chmod(os.path.join(root, name), 0o600)
+            else:
+                cmd = [*SUDO, 'find', usb_dir, '-name', '*.enc', '-exec', 'chmod', '600', '{}', '+']
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
             log_info(f"[setup_usb_secrets] *.enc 파일 권한 설정 완료 (600)")
         else:
             log_info(f"[setup_usb_secrets] {usb_dir}에 이미 파일이 존재하므로 복사를 건너뜁니다.")
         
         # 파일 목록 확인
-        cmd = ['sudo', 'ls', '-lh', usb_dir]
+        cmd = [*SUDO, 'ls', '-lh', usb_dir]
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         log_debug(f"[setup_usb_secrets] {usb_dir} 내용:\n{result.stdout.strip()}")
         
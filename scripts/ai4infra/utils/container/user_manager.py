@@ -6,6 +6,7 @@ import subprocess
 from dotenv import load_dotenv
 
 from common.logger import log_debug, log_error, log_info
+from common.sudo_helpers import SUDO
 
 load_dotenv()
 PROJECT_ROOT = os.getenv("PROJECT_ROOT")
@@ -24,12 +25,12 @@ def create_user(username: str, password: str = "bit") -> bool:
             return True
 
         # 2) 존재하지 않으면 `useradd`로 사용자 생성
-        cmd = ['sudo', 'useradd', '-m', '-s', '/bin/bash', username]
+        cmd = [*SUDO, 'useradd', '-m', '-s', '/bin/bash', username]
         subprocess.run(cmd, check=True)
         log_info(f"[create_user] useradd result → '{username}' 생성 완료")
 
         # 3) 비밀번호 설정
-        cmd = ['sudo', 'chpasswd']
+        cmd = [*SUDO, 'chpasswd']
         subprocess.run(cmd, input=f"{username}:{password}", text=True, check=True)
         log_info(f"[create_user] 사용자 '{username}' 비밀번호 설정 완료")
         return True
@@ -51,7 +52,7 @@ def add_docker_group(user: str):
             return True
         
         # docker 그룹에 추가
-        subprocess.run(['sudo', 'usermod', '-aG', 'docker', user], check=True)
+        subprocess.run([*SUDO, 'usermod', '-aG', 'docker', user], check=True)
         log_info(f"[add_docker_group] {user} 사용자를 docker 그룹에 추가했습니다.")
         return True
     
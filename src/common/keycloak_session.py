@@ -0,0 +1,64 @@
+"""
+파일명: src/common/keycloak_session.py
+목적: Keycloak Admin REST API 호출용 requests 세션 생성
+기능:
+  - timeout 미지정 호출에 기본 timeout 적용 (응답 없는 Keycloak에서 무한 대기 방지)
+  - 기동 직후 일시적 502/503/504 는 지수 백오프 + 지터로 재시도 (멱등 메서드만)
+  - keep-alive 연결 재사용 (스크립트별 단일 세션)
+변경이력:
+  - 2026-10-16: keycloak_setup.py / setup_keycloak_config.py 의 중복 정의 통합
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# timeout 미지정 호출의 기본값 (connect 3s, read 10s)
+DEFAULT_TIMEOUT = (3, 10)
+
+# 재시도 간격 0s, 2s, 4s (+ 최대 0.5s 지터)
+# - 502/503/504 재시도는 멱등 메서드만: POST 는 게이트웨이 504 이후에도 서버에서 이미 처리됐을 수 있음
+#   (예: LDAP component, protocol mapper 는 409 없이 중복 생성) → POST 는 연결 실패만 재시도
+# - raise_on_status=False: 재시도 소진 시 RetryError 대신 마지막 응답 반환 → 호출측 상태코드 분기 유지
+RETRY = Retry(
+    total=3,
+    backoff_factor=1.0,
+    backoff_jitter=0.5,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=["GET", "PUT", "DELETE"],
+    raise_on_status=False,
+)
+
+
+class TimeoutAdapter(HTTPAdapter):
+    """timeout 을 지정하지 않은 요청에 DEFAULT_TIMEOUT 적용 (requests는 timeout=None 을 명시 전달)"""
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = DEFAULT_TIMEOUT
+        return super().send(request, **kwargs)
+
+
+def make_keycloak_session(retry: bool = True) -> requests.Session:
+    """
+    Keycloak 호출용 세션 생성
+
+    Parameters
+    ----------
+    retry : bool
+        True 이면 RETRY 정책 적용 (Admin API 호출용).
+        False 이면 내부 재시도 없음 (readiness 폴링처럼 호출측이 백오프를 관리할 때)
+
+    Returns
+    -------
+    requests.Session
+        http/https 모두 TimeoutAdapter 가 mount 된 세션
+    """
+    session = requests.Session()
+    adapter = TimeoutAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=RETRY if retry else 0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
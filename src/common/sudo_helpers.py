@@ -7,12 +7,17 @@
   - 크로스 플랫폼 호환성 고려
 변경이력:
   - 2025-12-03: 최초 작성 (BenKorea)
+  - 2026-10-16: SUDO 접두어 상수 추가 (root 실행 시 sudo 생략)
 """
 
+import os
 import subprocess
 from pathlib import Path
 from typing import Union
 
+# root로 실행 중이면 sudo 접두어 생략 (프로세스 생성 1회 절감)
+SUDO: list[str] = [] if os.geteuid() == 0 else ["sudo"]
+
 
 def sudo_exists(path: Union[str, Path]) -> bool:
     """
@@ -36,7 +41,7 @@ def sudo_exists(path: Union[str, Path]) -> bool:
     - Path.exists()는 Permission denied 시 PermissionError 발생
     """
     result = subprocess.run(
-        ["sudo", "test", "-e", str(path)],
+        [*SUDO, "test", "-e", str(path)],
         capture_output=True
     )
     return result.returncode == 0
@@ -59,7 +64,7 @@ def sudo_mkdir(path: Union[str, Path], parents: bool = True) -> bool:
         성공 시 True, 실패 시 False
     """
     try:
-        cmd = ["sudo", "mkdir"]
+        cmd = [*SUDO, "mkdir"]
         if parents:
             cmd.append("-p")
         cmd.append(str(path))
@@ -92,7 +97,7 @@ def sudo_find_files(directory: Union[str, Path], pattern: str) -> list[Path]:
     - Path.glob()는 권한 문제로 실패할 수 있음
     """
     result = subprocess.run(
-        ["sudo", "find", str(directory), "-maxdepth", "1", "-name", pattern, "-type", "f"],
+        [*SUDO, "find", str(directory), "-maxdepth", "1", "-name", pattern, "-type", "f"],
         capture_output=True,
         text=True,
         check=False
@@ -0,0 +1,156 @@
+import ipaddress
+import os
+import stat
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+# Add paths to allow imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(PROJECT_ROOT / "scripts" / "ai4infra"))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+# Mock dotenv before importing certs_manager to avoid side effects
+with patch("dotenv.load_dotenv"):
+    from utils import certs_manager
+
+
+@pytest.fixture
+def cm(tmp_path, monkeypatch):
+    """BASE_PATH / PROJECT_ROOT 를 임시 디렉터리로 바꾸고 모듈 캐시 초기화"""
+    base = tmp_path / "base"
+    ca_dir = base / "certs" / "ca"
+    (tmp_path / "config").mkdir()
+
+    monkeypatch.setattr(certs_manager, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setattr(certs_manager, "BASE_DIR", str(base))
+    monkeypatch.setattr(certs_manager, "BASE_PATH", base)
+    monkeypatch.setattr(certs_manager, "CA_DIR", ca_dir)
+    monkeypatch.setattr(certs_manager, "CA_KEY", ca_dir / "rootCA.key")
+    monkeypatch.setattr(certs_manager, "CA_CERT", ca_dir / "rootCA.pem")
+
+    certs_manager._ca_cache.clear()
+    certs_manager._verify_cache.clear()
+    certs_manager._ensured_dirs.clear()
+    certs_manager._builder_cache.clear()
+    certs_manager.get_service_cert_paths.cache_clear()
+    certs_manager._load_service_cfg_cached.cache_clear()
+    return certs_manager
+
+
+def _write_cfg(root: Path, service: str, text: str) -> None:
+    (root / "config" / f"{service}.yml").write_text(text)
+
+
+class TestParseSan:
+    def test_dns_and_ip(self):
+        san = certs_manager._parse_san("DNS:a.internal, DNS:b ,IP:127.0.0.1")
+        assert san.get_values_for_type(x509.DNSName) == ["a.internal", "b"]
+        assert san.get_values_for_type(x509.IPAddress) == [ipaddress.ip_address("127.0.0.1")]
+
+    def test_unsupported_entry(self):
+        with pytest.raises(ValueError):
+            certs_manager._parse_san("DNS:a,URI:http://x")
+
+
+class TestWritePem:
+    def test_key_mode_ignores_umask(self, cm, tmp_path):
+        path = tmp_path / "sub" / "private.key"
+        old = os.umask(0)
+        try:
+            cm._write_pem(path, b"secret", 0o600)
+        finally:
+            os.umask(old)
+        assert path.read_bytes() == b"secret"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_existing_file_is_tightened(self, cm, tmp_path):
+        path = tmp_path / "private.key"
+        path.write_bytes(b"old-and-longer")
+        path.chmod(0o644)
+        cm._write_pem(path, b"new", 0o600)
+        assert path.read_bytes() == b"new"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+class TestKeyAlgorithm:
+    def test_default_is_ecdsa(self, cm):
+        assert cm.resolve_key_algorithm("vault") == "ecdsa"
+
+    def test_config_key_algo(self, cm, tmp_path):
+        _write_cfg(tmp_path, "vault", 'cert:\n  key_algo: "rsa"\n')
+        assert cm.resolve_key_algorithm("vault") == "rsa"
+
+    @pytest.mark.parametrize("algo, key_type, size", [
+        ("ecdsa", ec.EllipticCurvePrivateKey, 256),
+        ("rsa", rsa.RSAPrivateKey, 2048),
+    ])
+    def test_create_service_key(self, cm, tmp_path, algo, key_type, size):
+        key_path = tmp_path / "private.key"
+        assert cm.create_service_key("svc", key_path, algo)
+        key = serialization.load_pem_private_key(key_path.read_bytes(), password=None)
+        assert isinstance(key, key_type)
+        assert key.key_size == size
+
+    def test_unknown_algorithm(self, cm, tmp_path):
+        assert not cm.create_service_key("svc", tmp_path / "private.key", "ed25519")
+
+
+class TestServiceCertificate:
+    def test_create_and_reuse(self, cm):
+        assert cm.create_root_ca()
+        assert cm.create_service_certificate("vault")
+
+        ca_cert = x509.load_pem_x509_certificate(cm.CA_CERT.read_bytes())
+        paths = cm.resolve_cert_paths("vault")
+        assert stat.S_IMODE(paths["key"].stat().st_mode) == 0o600
+        assert stat.S_IMODE(paths["crt"].stat().st_mode) == 0o644
+        cert = x509.load_pem_x509_certificate(paths["crt"].read_bytes())
+        cert.verify_directly_issued_by(ca_cert)
+        assert paths["root_ca"].read_bytes() == cm.CA_CERT.read_bytes()
+
+        # 재실행: SAN 일치 + 만료 여유 → 기존 인증서 유지
+        before = paths["crt"].read_bytes()
+        assert cm.create_service_certificate("vault")
+        assert paths["crt"].read_bytes() == before
+
+
+class TestServiceCertificates:
+    def test_batch(self, cm, tmp_path):
+        _write_cfg(tmp_path, "ldap", 'cert:\n  key_algo: "rsa"\n')
+        # Root CA 는 create_service_certificates 가 먼저 생성 (workers=1: 풀 없이 순차 처리)
+        assert cm.create_service_certificates(["vault", "ldap"], workers=1) == {"vault": True, "ldap": True}
+
+        ca_cert = x509.load_pem_x509_certificate(cm.CA_CERT.read_bytes())
+        for svc in ("vault", "ldap"):
+            cert = x509.load_pem_x509_certificate(cm.resolve_cert_paths(svc)["crt"].read_bytes())
+            cert.verify_directly_issued_by(ca_cert)
+
+        # cert.key_algo 를 지정한 ldap 만 RSA, 그 외 서비스는 ECDSA
+        keys = {
+            svc: serialization.load_pem_private_key(
+                cm.resolve_cert_paths(svc)["key"].read_bytes(), password=None
+            )
+            for svc in ("vault", "ldap")
+        }
+        assert isinstance(keys["vault"], ec.EllipticCurvePrivateKey)
+        assert isinstance(keys["ldap"], rsa.RSAPrivateKey)
+
+
+class TestCertMatches:
+    def test_conditions(self, cm):
+        assert cm.create_root_ca()
+        assert cm.create_service_certificate("vault")
+        crt = cm.resolve_cert_paths("vault")["crt"]
+        default_san = cm.build_default_san("vault")
+
+        assert cm._cert_matches(crt, default_san)
+        assert not cm._cert_matches(crt, cm._parse_san("DNS:other"))
+        # 발급 유효기간(365일)보다 긴 여유를 요구하면 재발급 대상
+        assert not cm._cert_matches(crt, default_san, min_days_left=400)
+        assert not cm._cert_matches(crt.with_name("missing.crt"), default_san)
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add paths to allow imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(PROJECT_ROOT / "scripts" / "ai4infra"))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+# Mock dotenv before importing setup_keycloak_config to avoid side effects
+with patch("dotenv.load_dotenv"):
+    import setup_keycloak_config as kc
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    """임시 .env 로 교체하고 메모리 상태 초기화"""
+    path = tmp_path / ".env"
+    path.write_text(
+        "# KEYCLOAK\n"
+        "KEYCLOAK_PORT=8484\n"
+        "# OIDC_CLIENT_SECRET=commented\n"
+        "OIDC_CLIENT_SECRET=old\n"
+        "\n"
+        "OTHER=value\n"
+    )
+    monkeypatch.setattr(kc, "ENV_PATH", str(path))
+    monkeypatch.setattr(kc, "_env_lines", None)
+    monkeypatch.setattr(kc, "_env_index", {})
+    return path
+
+
+class TestEnvEditor:
+    def test_update_existing_and_append(self, env_file):
+        kc.update_env_var("OIDC_CLIENT_SECRET", "new")
+        kc.update_env_var("NEW_KEY", "added")
+        kc.flush_env()
+
+        assert env_file.read_text() == (
+            "# KEYCLOAK\n"
+            "KEYCLOAK_PORT=8484\n"
+            "# OIDC_CLIENT_SECRET=commented\n"
+            "OIDC_CLIENT_SECRET=new\n"
+            "\n"
+            "OTHER=value\n"
+            "NEW_KEY=added\n"
+        )
+
+    def test_value_kept_literally(self, env_file):
+        """정규식 치환을 쓰지 않으므로 $, \\1 등이 그대로 기록됨"""
+        kc.update_env_var("OTHER", r"a$b\1c")
+        kc.update_env_var("OTHER", r"x$y\2z")
+        kc.flush_env()
+
+        lines = env_file.read_text().splitlines()
+        assert lines.count(r"OTHER=x$y\2z") == 1
+        assert not any(line.startswith("OTHER=value") for line in lines)
+
+    def test_file_written_only_on_flush(self, env_file):
+        before = env_file.read_text()
+        kc.update_env_var("KEYCLOAK_PORT", "9000")
+        assert env_file.read_text() == before
+
+        kc.flush_env()
+        assert "KEYCLOAK_PORT=9000" in env_file.read_text()
+
+    def test_flush_without_updates(self, env_file):
+        mtime = env_file.stat().st_mtime_ns
+        kc.flush_env()
+        assert env_file.stat().st_mtime_ns == mtime
@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add paths to allow imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.append(str(PROJECT_ROOT / "scripts" / "ai4infra"))
+sys.path.append(str(PROJECT_ROOT / "src"))
+
+import seed_users
+
+
+class TestGenerateLdif:
+    def test_one_entry_per_user(self):
+        entries = seed_users.generate_ldif().strip("\n").split("\n\n")
+        assert len(entries) == len(seed_users.USERS)
+        assert all(e.startswith("dn: uid=") for e in entries)
+
+    def test_entry_fields(self):
+        ldif = seed_users.generate_ldif()
+        entry = next(e for e in ldif.split("\n\n") if "uid=rmchair," in e)
+        assert entry.splitlines() == [
+            "dn: uid=rmchair,dc=ai4infra,dc=internal",
+            "changetype: add",
+            "objectClass: inetOrgPerson",
+            "objectClass: organizationalPerson",
+            "objectClass: top",
+            "cn: Kevin Kim",
+            "sn: Kim",
+            "uid: rmchair",
+            "mail: rmchair@r.python.study",
+            "userPassword: rmchair_ldap",
+        ]
+
+    def test_ends_with_blank_line(self):
+        """ldapadd 는 엔트리를 빈 줄로 구분 → 마지막 엔트리도 빈 줄로 종료"""
+        assert seed_users.generate_ldif().endswith("\n\n")
+
+
+class TestApplyLdif:
+    def test_ldif_passed_via_stdin(self):
+        with patch("seed_users.subprocess.run") as mock_run:
+            seed_users.apply_ldif("dn: uid=x\n\n")
+
+        args, kwargs = mock_run.call_args
+        assert args[0][-1] == "-c"
+        assert kwargs["input"] == "dn: uid=x\n\n"
+        assert kwargs["text"] is True